@@ -0,0 +1,283 @@
+"""
+End-to-end discovery benchmark against a local replay server.
+
+A stand-in for gql.twitch.tv and the Facepunch drops page runs in a child process and
+replays the responses in benchmarks/fixtures/gql/ (Inventory, ViewerDropsDashboard,
+DirectoryPage_Game, DirectoryGameRedirect) and benchmarks/fixtures/facepunch_active.html,
+scaled to each scenario's campaign count, with configurable latency and error injection.
+StreamerManager is pointed at it and runs a cold discovery (campaigns + Rust drops) and
+a cold slug resolution for every campaign game, in a scratch directory so no cache is reused.
+
+Reports wall time, request count and time spent waiting on the client-side rate limiter
+(from gibdrop's network telemetry) and peak memory.
+
+Usage: python3 benchmarks/bench_discovery.py [--scenario small|medium|large ...]
+           [--latency-ms MS] [--jitter-ms MS] [--error-rate FRACTION] [--pages N] [--seed N]
+           [--rate-limit RATE[/BURST]]
+"""
+import argparse
+import contextlib
+import copy
+import io
+import json
+import multiprocessing
+import os
+import pickle
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import gibdrop
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+GQL_FIXTURES_DIR = os.path.join(FIXTURES_DIR, "gql")
+FACEPUNCH_FIXTURE = os.path.join(FIXTURES_DIR, "facepunch_active.html")
+
+# name: (campaigns, share of them that come from the Inventory rather than the dashboard)
+SCENARIOS = {
+    "small": (5, 0.4),
+    "medium": (40, 0.25),
+    "large": (200, 0.2),
+}
+
+
+def load_fixture(operation):
+    with open(os.path.join(GQL_FIXTURES_DIR, f"{operation}.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# ReplayServer: Serves the recorded fixtures, scaled to a scenario, with injected latency and errors.
+class ReplayServer:
+    def __init__(self, campaigns, inventory_share, pages_per_game, latency_ms, jitter_ms, error_rate, seed):
+        self.inventory_count = round(campaigns * inventory_share)
+        self.dashboard_count = campaigns - self.inventory_count
+        self.pages_per_game = pages_per_game
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.fixtures = {name: load_fixture(name) for name in ("Inventory", "ViewerDropsDashboard", "DirectoryPage_Game", "DirectoryGameRedirect")}
+        with open(FACEPUNCH_FIXTURE, "rb") as f:
+            self.facepunch_page = f.read()
+
+    @staticmethod
+    def scale_campaigns(templates, count, prefix):
+        """count copies of the fixture campaigns, each with its own id, name and game."""
+        campaigns = []
+        for i in range(count):
+            campaign = copy.deepcopy(templates[i % len(templates)])
+            campaign["id"] = f"{prefix}-{i}"
+            campaign["name"] = f"{campaign['name']} {prefix}{i}"
+            campaign["status"] = "ACTIVE"
+            campaign["game"].update({"id": f"{prefix}{i}", "name": f"{prefix.title()} Game {i}", "displayName": f"{prefix.title()} Game {i}", "slug": f"{prefix}-game-{i}"})
+            campaigns.append(campaign)
+        return campaigns
+
+    def respond(self, operation):
+        name = operation.get("operationName")
+        variables = operation.get("variables") or {}
+        if name == "Inventory":
+            data = copy.deepcopy(self.fixtures["Inventory"])
+            inventory = data["data"]["currentUser"]["inventory"]
+            inventory["dropCampaignsInProgress"] = self.scale_campaigns(inventory["dropCampaignsInProgress"], self.inventory_count, "inv")
+            return data
+        if name == "ViewerDropsDashboard":
+            data = copy.deepcopy(self.fixtures["ViewerDropsDashboard"])
+            user = data["data"]["currentUser"]
+            user["dropCampaigns"] = self.scale_campaigns(user["dropCampaigns"], self.dashboard_count, "dash")
+            return data
+        if name == "DirectoryPage_Game":
+            data = copy.deepcopy(self.fixtures["DirectoryPage_Game"])
+            page = int((variables.get("cursor") or "0:").split(":")[0]) + 1 if variables.get("cursor") else 0
+            streams = data["data"]["game"]["streams"]
+            slug = variables.get("slug", "")
+            edges = streams["edges"][:variables.get("limit") or len(streams["edges"])]
+            for k, edge in enumerate(edges):
+                broadcaster = edge["node"]["broadcaster"]
+                broadcaster["displayName"] = f"{broadcaster['displayName']}_{slug}_{page}"
+                broadcaster["login"] = broadcaster["displayName"].lower()
+                edge["cursor"] = f"{page}:{k}"
+            streams["edges"] = edges
+            streams["pageInfo"]["hasNextPage"] = page + 1 < self.pages_per_game
+            return data
+        if name == "DirectoryGameRedirect":
+            data = copy.deepcopy(self.fixtures["DirectoryGameRedirect"])
+            data["data"]["game"]["slug"] = "-".join((variables.get("name") or "").lower().split())
+            return data
+        return {"errors": [{"message": f"PersistedQueryNotFound: {name}"}]}
+
+    def delay_and_fail(self):
+        """Sleep the injected latency; True if this request should fail."""
+        with self.lock:
+            delay = max(0.0, self.latency_ms + self.random.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+            fail = self.random.random() < self.error_rate
+        time.sleep(delay)
+        return fail
+
+    def handler_class(self):
+        replay = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def send(self, status, body, content_type):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)))
+                if replay.delay_and_fail():
+                    return self.send(503, b'{"error":"Service Unavailable","status":503}', "application/json")
+                operations = payload if isinstance(payload, list) else [payload]
+                results = [replay.respond(op) for op in operations]
+                body = json.dumps(results if isinstance(payload, list) else results[0]).encode("utf-8")
+                self.send(200, body, "application/json")
+
+            def do_GET(self):
+                if replay.delay_and_fail():
+                    return self.send(503, b"Service Unavailable", "text/plain")
+                self.send(200, replay.facepunch_page, "text/html; charset=utf-8")
+
+        return Handler
+
+
+class QuietHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # The Facepunch parser closes the stream once it has what it needs; that reset is expected
+        if not isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+
+def serve(ready, options):
+    server = QuietHTTPServer(("127.0.0.1", 0), ReplayServer(**options).handler_class())
+    ready.put(server.server_address[1])
+    server.serve_forever()
+
+
+@contextlib.contextmanager
+def replay_server(**options):
+    """Run a ReplayServer in a child process (so it doesn't count towards peak memory) and yield its port."""
+    ready = multiprocessing.Queue()
+    process = multiprocessing.Process(target=serve, args=(ready, options), daemon=True)
+    process.start()
+    try:
+        yield ready.get(timeout=10)
+    finally:
+        process.terminate()
+        process.join()
+
+
+def measure(phase):
+    """Run phase() with stdout muted; return (result, wall seconds, peak traced bytes, telemetry summary)."""
+    gibdrop.TELEMETRY.summary(reset=True)
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = phase()
+    wall = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, wall, peak, gibdrop.TELEMETRY.summary(reset=True)
+
+
+def run_scenario(port, workdir):
+    """Cold discovery and slug resolution in workdir; returns [(phase, result, wall, peak, telemetry)]."""
+    gibdrop.GQL_URL = f"http://127.0.0.1:{port}/gql"
+    gibdrop.FACEPUNCH_DROPS_URL = f"http://127.0.0.1:{port}/gg/drops"
+    cookie_path = os.path.join(workdir, "cookies.pkl")
+    with open(cookie_path, "wb") as f:
+        pickle.dump([{"name": "auth-token", "value": "replay"}], f)
+    os.environ[gibdrop.COOKIE_FILE_ENV] = cookie_path
+
+    # Caches live next to gibdrop.py; keep every scenario's cold and out of the checkout
+    cache_dir = os.path.join(workdir, ".gibdrop_cache")
+    gibdrop.FACEPUNCH_CACHE_FILE = os.path.join(cache_dir, "facepunch.json")
+    gibdrop.COOKIE_CACHE_FILE = os.path.join(cache_dir, "twitch_cookies.json")
+    gibdrop.SLUG_CACHE_FILE = os.path.join(cache_dir, "game_slugs.json")
+
+    previous_cwd = os.getcwd()
+    os.chdir(workdir)
+    manager = gibdrop.StreamerManager(discovery_cache=gibdrop.DiscoveryCache(os.path.join(cache_dir, "discovery.json")),
+                                      slug_cache=gibdrop.SlugCache(gibdrop.SLUG_CACHE_FILE))
+    try:
+        rows = []
+        results, *stats = measure(manager.refresh_discovery)
+        rows.append(("discovery", results, *stats))
+        game_names = [c.game for c in results.get("campaigns") or []]
+        # Discovery learned the slugs from campaign data; start the resolution phase cold
+        if os.path.exists(gibdrop.SLUG_CACHE_FILE):
+            os.remove(gibdrop.SLUG_CACHE_FILE)
+        manager.slug_cache = gibdrop.SlugCache(gibdrop.SLUG_CACHE_FILE)
+        slugs, *stats = measure(lambda: manager.resolve_game_slugs(game_names))
+        rows.append(("resolve slugs", slugs, *stats))
+        return rows
+    finally:
+        manager.gql.close()
+        os.chdir(previous_cwd)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="scenario to run (repeatable, default: all)")
+    parser.add_argument("--latency-ms", type=float, default=40.0, help="latency added to every replayed response")
+    parser.add_argument("--jitter-ms", type=float, default=10.0, help="random +/- variation of the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with HTTP 503")
+    parser.add_argument("--pages", type=int, default=3, help="directory pages available per game")
+    parser.add_argument("--seed", type=int, default=1, help="seed for latency jitter and error injection")
+    parser.add_argument("--rate-limit", type=gibdrop.TokenBucket.parse, metavar="RATE[/BURST]",
+                        help=f"client-side rate limit, 0 for none (default: gibdrop's {gibdrop.RATE_LIMIT:g}/{gibdrop.RATE_LIMIT_BURST})")
+    args = parser.parse_args()
+
+    # Telemetry counts the requests; the summary is printed here, not by refresh_discovery
+    gibdrop.TELEMETRY.show_summary = False
+    gibdrop.TELEMETRY.log_path = None
+    gibdrop.requests.Session  # Import requests now so the first scenario's peak memory isn't import cost
+    if args.rate_limit:
+        gibdrop.RATE_LIMITER.configure(*args.rate_limit)
+
+    failures = 0
+    limiter = gibdrop.RATE_LIMITER
+    rate_limit = f"{limiter.rate:g}/s (burst {limiter.burst:g})" if limiter.rate else "off"
+    print(f"Latency {args.latency_ms:.0f}±{args.jitter_ms:.0f} ms, error rate {args.error_rate:.0%}, {args.pages} directory pages per game, rate limit {rate_limit}\n")
+    print(f"{'scenario':<8} {'campaigns':>9} {'phase':<14} {'wall s':>7} {'requests':>8} {'errors':>6} {'wait s':>7} {'KB in':>8} {'peak MB':>8}")
+    for name in args.scenario or list(SCENARIOS):
+        campaigns, inventory_share = SCENARIOS[name]
+        options = dict(campaigns=campaigns, inventory_share=inventory_share, pages_per_game=args.pages,
+                       latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate, seed=args.seed)
+        with replay_server(**options) as port, tempfile.TemporaryDirectory() as workdir:
+            rows = run_scenario(port, workdir)
+        for phase, result, wall, peak, telemetry in rows:
+            operations = telemetry["operation"].values()
+            requests_made = sum(stats["calls"] for stats in operations)
+            errors = sum(stats["errors"] for stats in operations)
+            wait_s = sum(stats["wait_ms"] for stats in operations) / 1000
+            kb_in = sum(stats["bytes_in"] for stats in operations) / 1024
+            print(f"{name:<8} {campaigns:>9} {phase:<14} {wall:>7.2f} {requests_made:>8} {errors:>6} {wait_s:>7.2f} {kb_in:>8.1f} {peak / 1024 / 1024:>8.1f}")
+        found = len(rows[0][1].get("campaigns") or [])
+        if args.error_rate == 0 and found != campaigns:
+            failures += 1
+            print(f"  ❌ Discovered {found} of {campaigns} campaigns")
+
+    if failures:
+        print(f"\n❌ {failures} scenario(s) returned incomplete results")
+        return 1
+    print("\n✅ All scenarios completed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""
+Compare the streaming Facepunch drops parser with the full BeautifulSoup parse.
+
+For every page in benchmarks/fixtures/facepunch_*.html this checks that both parsers
+return the same result, then reports parse time, bytes read and peak memory.
+
+Usage: python3 benchmarks/bench_facepunch_parse.py [--repeat N]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import gibdrop
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def chunked(data, size=gibdrop.FACEPUNCH_CHUNK_SIZE):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+def measure(func, repeat):
+    """Return (result, best seconds per run, peak traced bytes of one run)."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per parser (best is reported)")
+    args = parser.parse_args()
+
+    manager = gibdrop.StreamerManager()
+    paths = sorted(glob.glob(os.path.join(FIXTURES_DIR, "facepunch_*.html")))
+    if not paths:
+        print(f"No Facepunch fixtures found in {FIXTURES_DIR}")
+        return 1
+
+    mismatches = 0
+    print(f"{'fixture':<38} {'parser':<10} {'time ms':>9} {'read KB':>9} {'peak KB':>9}")
+    for path in paths:
+        with open(path, "rb") as f:
+            body = f.read()
+        name = os.path.basename(path)
+
+        soup_result, soup_time, soup_peak = measure(lambda: manager._parse_rust_drops_page(body.decode("utf-8")), args.repeat)
+        (stream_result, bytes_read, _), stream_time, stream_peak = measure(lambda: gibdrop.parse_rust_drops_stream(chunked(body)), args.repeat)
+
+        print(f"{name:<38} {'soup':<10} {soup_time * 1000:>9.2f} {len(body) / 1024:>9.1f} {soup_peak / 1024:>9.1f}")
+        print(f"{'':<38} {'stream':<10} {stream_time * 1000:>9.2f} {bytes_read / 1024:>9.1f} {stream_peak / 1024:>9.1f}")
+        print(f"{'':<38} {'saving':<10} {soup_time / stream_time:>8.1f}x {'':>9} {soup_peak / max(stream_peak, 1):>8.1f}x")
+
+        if soup_result != stream_result:
+            mismatches += 1
+            print(f"  ❌ Result mismatch for {name}:")
+            print(f"     soup:   {soup_result}")
+            print(f"     stream: {stream_result}")
+
+    if mismatches:
+        print(f"\n❌ {mismatches} fixture(s) parsed differently")
+        return 1
+    print("\n✅ Streaming parser matches BeautifulSoup on all fixtures")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
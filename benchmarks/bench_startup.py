@@ -0,0 +1,101 @@
+"""
+Measure gibdrop startup for headless commands against a time budget.
+
+Each command runs in a scratch directory (after one warm-up run that writes the
+environment marker and bytecode cache). Reported time is the best wall time minus a
+bare `python -c pass`, so only gibdrop's own startup counts against the budget.
+`-X importtime` lists the slowest imports on top of the bare interpreter's and flags
+heavy modules that a headless command should not load.
+
+The budget applies to `python -m gibdrop`: running gibdrop.py as a script recompiles
+it on every launch (scripts never use __pycache__), so those rows are informational.
+
+Usage: python3 benchmarks/bench_startup.py [--repeat N] [--budget-ms MS] [--top N]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GIBDROP = os.path.join(REPO_DIR, "gibdrop.py")
+
+# Only needed for discovery, so status/--help must not import them
+HEAVY_MODULES = ["requests", "bs4", "urllib.request", "concurrent.futures"]
+
+# (label, interpreter arguments, checked against the budget)
+COMMANDS = [
+    ("gibdrop.py status --json", [GIBDROP, "status", "--json"], False),
+    ("-m gibdrop --help", ["-m", "gibdrop", "--help"], True),
+    ("-m gibdrop status --json", ["-m", "gibdrop", "status", "--json"], True),
+]
+
+
+def run(args, cwd, env):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable] + args, cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    return time.perf_counter() - start, result.stderr
+
+
+def best_of(args, cwd, env, repeat):
+    return min(run(args, cwd, env)[0] for _ in range(repeat))
+
+
+def parse_importtime(stderr):
+    """Return [(cumulative_us, module)] for every import line in -X importtime output."""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        try:
+            imports.append((int(cumulative.strip()), name.strip()))
+        except ValueError:
+            continue  # header line
+    return imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7, help="timed runs per command (best is reported)")
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="allowed startup on top of a bare interpreter")
+    parser.add_argument("--top", type=int, default=5, help="slowest imports to list per command")
+    args = parser.parse_args()
+
+    env = dict(os.environ, PYTHONPATH=REPO_DIR)
+    failures = 0
+    with tempfile.TemporaryDirectory() as cwd:
+        bare = best_of(["-c", "pass"], cwd, env, args.repeat)
+        bare_imports = {name for _, name in parse_importtime(run(["-X", "importtime", "-c", "pass"], cwd, env)[1])}
+        print(f"Bare interpreter: {bare * 1000:.1f} ms, budget: +{args.budget_ms:.0f} ms\n")
+        print(f"{'command':<28} {'total ms':>9} {'own ms':>9} {'+imports':>8}")
+        for label, command, budgeted in COMMANDS:
+            run(command, cwd, env)  # warm-up: environment marker and bytecode cache
+            total = best_of(command, cwd, env, args.repeat)
+            own_ms = (total - bare) * 1000
+            _, stderr = run(["-X", "importtime"] + command, cwd, env)
+            imports = [(cumulative, name) for cumulative, name in parse_importtime(stderr) if name not in bare_imports]
+            print(f"{label:<28} {total * 1000:>9.1f} {own_ms:>9.1f} {len(imports):>8}")
+            for cumulative, name in sorted(imports, reverse=True)[:args.top]:
+                print(f"{'':<4}{name:<40} {cumulative / 1000:>7.1f} ms")
+
+            loaded = {name for _, name in imports}
+            heavy = [name for name in HEAVY_MODULES if name in loaded]
+            if heavy:
+                failures += 1
+                print(f"  ❌ Imported heavy modules: {', '.join(heavy)}")
+            if budgeted and own_ms > args.budget_ms:
+                failures += 1
+                print(f"  ❌ Over budget by {own_ms - args.budget_ms:.1f} ms")
+
+    if failures:
+        print(f"\n❌ {failures} startup check(s) failed")
+        return 1
+    print("\n✅ All commands start within budget without heavy imports")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,19 +3,41 @@ import os
 import subprocess
 import re
 import shutil
-import urllib.request
-import pickle
+import importlib
+import importlib.util
+import json
+import hashlib
+import codecs
+import math
+from html.parser import HTMLParser
+import threading
+import time
+import random
+import argparse
+import signal
 from datetime import datetime, timezone
-import gibdrop_dockermgr
 
-# Try to import optional dependencies - will be installed if missing
-try:
-    import requests
-    from bs4 import BeautifulSoup
-except ImportError:
-    # These will be handled by the bootstrap code below
-    requests = None
-    BeautifulSoup = None
+# LazyModule: Stands in for a module and imports it on first attribute access, so startup only pays for what the command uses.
+class LazyModule:
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            try:
+                self._module = importlib.import_module(self._name)
+            except ImportError:
+                if not rebootstrap_allowed(self._name):
+                    raise
+                # The environment changed since it was verified; re-run the bootstrap
+                invalidate_environment()
+                bootstrap_dependencies()
+                raise
+        return getattr(self._module, attr)
+
+requests = LazyModule("requests")
+gibdrop_dockermgr = LazyModule("gibdrop_dockermgr")
 
 def reset_terminal_colors():
     """Reset terminal colors to default after Docker operations that may leave ANSI color codes active."""
@@ -23,7 +45,12 @@ def reset_terminal_colors():
 
 # --- Bootstrap: install dependencies if missing ---
 REQUIRED_PACKAGES = ["requests", "beautifulsoup4"]
+REQUIRED_MODULES = ["requests", "bs4"]  # Import names of REQUIRED_PACKAGES
 VENV_DIR = ".gibdrop_venv"
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(SCRIPT_DIR, ".gibdrop_cache")
+BOOTSTRAP_ENV = "GIBDROP_BOOTSTRAPPED"  # Set before the bootstrap restarts the script, so it's only re-run once
+ENVIRONMENT_MARKER_FILE = os.path.join(CACHE_DIR, "environment.json")
 
 def in_venv():
     return (
@@ -61,15 +88,58 @@ def ensure_venv_available():
             print(f"Failed to install 'venv': {e}\nPlease install python3-venv manually using your system's package manager.")
             return False
 
-try:
-    # Check if we successfully imported the required packages
-    if requests is None or BeautifulSoup is None:
-        raise ImportError("Dependencies not available")
-    # Test the imports
-    import requests
-    from bs4 import BeautifulSoup
-except ImportError:
+def environment_fingerprint():
+    return {'python': sys.executable, 'version': sys.version, 'modules': REQUIRED_MODULES}
+
+def invalidate_environment():
+    try:
+        os.remove(ENVIRONMENT_MARKER_FILE)
+    except OSError:
+        pass
+
+def rebootstrap_allowed(module_name):
+    """
+    Whether a failed lazy import of module_name may re-run the bootstrap. Only the required
+    third-party modules can be fixed by it, it restarts the process (so never from a worker
+    thread), and it isn't retried after a restart that didn't help.
+    """
+    return (
+        module_name in REQUIRED_MODULES and
+        not os.environ.get(BOOTSTRAP_ENV) and
+        threading.current_thread() is threading.main_thread()
+    )
+
+def environment_verified():
+    """
+    True if this interpreter was already verified to have the required modules.
+    Checked with one small file read instead of importing requests/bs4 on every launch.
+    """
+    try:
+        with open(ENVIRONMENT_MARKER_FILE, "r", encoding="utf-8") as f:
+            return json.load(f) == environment_fingerprint()
+    except (OSError, ValueError):
+        return False
+
+def ensure_dependencies():
+    """
+    Make sure the required modules are importable without importing them.
+    Missing modules are installed by bootstrap_dependencies, which restarts the script.
+    """
+    if environment_verified():
+        return
+    if any(importlib.util.find_spec(name) is None for name in REQUIRED_MODULES):
+        bootstrap_dependencies()
+        return
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(ENVIRONMENT_MARKER_FILE, "w", encoding="utf-8") as f:
+            json.dump(environment_fingerprint(), f)
+    except OSError:
+        pass  # Not fatal, the next launch just probes again
+
+def bootstrap_dependencies():
     print("Missing dependencies. Attempting system install...")
+    os.environ[BOOTSTRAP_ENV] = "1"  # Inherited by the restarted script
     try:
         subprocess.check_call([sys.executable, "-m", "pip", "install"] + REQUIRED_PACKAGES)
         print("Dependencies installed. Restarting...")
@@ -97,76 +167,1185 @@ except ImportError:
             print("Failed to install dependencies, even in a virtual environment. Exiting.")
             sys.exit(1)
 
+# --- Twitch GraphQL ---
+GQL_URL = "https://gql.twitch.tv/gql"
+GQL_CLIENT_ID = "kimne78kx3ncx6brgo4mv6wki5h1ko"
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+GQL_TIMEOUT = (5, 15)  # (connect, read) seconds
+GQL_POOL_SIZE = 10
+GQL_BATCH_SIZE = 20  # Operations per JSON-array POST
+DIRECTORY_PAGE_SIZE = 20
+DIRECTORY_COUNT_MODE = False  # Walk each campaign's whole directory for real streamer/viewer totals
+DIRECTORY_COUNT_PAGE_SIZE = 100
+DIRECTORY_COUNT_BUDGET = 15  # Seconds per campaign before a count is reported as a lower bound
+DISCOVERY_WORKERS = 6  # Concurrent per-campaign streamer lookups (keep <= GQL_POOL_SIZE)
+STREAM_AGE_SOFT_LIMIT = 6 * 60 * 60  # Streams live longer than this are ranked as increasingly likely to end (seconds)
+GQL_RETRIES = 3  # Extra attempts after a 429/5xx, connection error or transient GraphQL error
+GQL_RETRY_STATUSES = (429, 500, 502, 503, 504)
+GQL_BACKOFF_BASE = 0.5  # Seconds before the first retry, doubled per attempt (with jitter)
+GQL_BACKOFF_MAX = 8
+GQL_RETRY_AFTER_MAX = 20  # A longer Retry-After isn't waited out; the circuit opens for that long instead
+GQL_CIRCUIT_THRESHOLD = 5  # Consecutive failed attempts before requests fail fast
+GQL_CIRCUIT_COOLDOWN = 30  # Seconds the circuit stays open before one trial request is let through
+GQL_TRANSIENT_ERRORS = ("service timeout", "service error", "service unavailable", "failed integrity check")
+
+PERSISTED_QUERIES = {
+    "DirectoryGameRedirect": "1f0300090caceec51f33c5e20647aceff9017f740f223c3c532ba6fa59f6b6cc",
+    "DirectoryPage_Game": "c7c9d5aad09155c4161d2382092dc44610367f3536aac39019ec2582ae5065f9",
+    "Inventory": "d86775d0ef16a63a33ad52e80eaff963b2d5b72fada7c991504a57496e1d8e4b",
+    "ViewerDropsDashboard": "5a33c1d45d3012503f8c9a7eccdde3de5b4b5d9ec262cce16d2e93bd5afecbb0",
+}
+
+TIMINGS_ENV = "GIBDROP_TIMINGS"          # "1" prints a network summary after each discovery (same as --timings)
+TIMINGS_LOG_ENV = "GIBDROP_TIMINGS_LOG"  # Append one JSON line per outbound request to this file (same as --timings-log)
+RATE_LIMIT = 15.0  # Requests per second across all Twitch GQL and Facepunch requests (0 = unlimited)
+RATE_LIMIT_BURST = 30  # Requests that may go out back to back before the rate applies
+RATE_LIMIT_ENV = "GIBDROP_RATE_LIMIT"  # "RATE" or "RATE/BURST", e.g. "5/10" (same as --rate-limit)
+
+# NetworkTelemetry: Records every outbound request (latency, status, bytes, retries, rate-limit wait, caller) for --timings and JSON-lines logs.
+# Only running totals are kept in memory, so a long-running daemon doesn't grow; the log file has the raw records.
+class NetworkTelemetry:
+    def __init__(self, show_summary=False, log_path=None):
+        self.show_summary = show_summary
+        self.log_path = log_path
+        self._lock = threading.Lock()
+        self._reset_window()
+
+    def _reset_window(self):
+        self._groups = {'operation': {}, 'caller': {}, 'detail': {}}
+        self._window_started = time.monotonic()
+
+    def record(self, kind, operation, started, status=None, bytes_out=0, bytes_in=0, retries=0, ops=1,
+               detail=None, error=None, caller=None, waited=0.0):
+        """
+        Record one request that began at time.perf_counter() value `started`, after waiting `waited`
+        seconds for the rate limiter (not included in its latency).
+        The caller defaults to the nearest function on the stack outside the HTTP plumbing.
+        """
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        entry = {
+            'ts': round(time.time(), 3),
+            'kind': kind,
+            'operation': operation,
+            'ops': ops,
+            'detail': detail,
+            'caller': caller or network_caller(),
+            'thread': threading.current_thread().name,
+            'status': status,
+            'ms': round(elapsed_ms, 1),
+            'bytes_out': bytes_out,
+            'bytes_in': bytes_in,
+            'retries': retries,
+            'wait_ms': round(waited * 1000, 1),
+            'error': error,
+        }
+        failed = error is not None or status is None or not (200 <= status < 400)
+        with self._lock:
+            for group, key in (('operation', f"{kind} {operation}"), ('caller', entry['caller']), ('detail', detail)):
+                if key is None:
+                    continue
+                stats = self._groups[group].setdefault(key, {'calls': 0, 'errors': 0, 'ms': 0.0, 'max_ms': 0.0, 'bytes_out': 0, 'bytes_in': 0, 'retries': 0, 'wait_ms': 0.0})
+                stats['calls'] += 1
+                stats['errors'] += failed
+                stats['ms'] += elapsed_ms
+                stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+                stats['bytes_out'] += bytes_out
+                stats['bytes_in'] += bytes_in
+                stats['retries'] += retries > 0  # Requests that were a retry of an earlier attempt
+                stats['wait_ms'] += waited * 1000
+            if self.log_path:
+                try:
+                    with open(self.log_path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(entry) + "\n")
+                except OSError as e:
+                    print(f"⚠️  Could not write timings log: {e}")
+                    self.log_path = None
+        return entry
+
+    def summary(self, reset=False):
+        """Totals since the last reset: {'wall_s', 'operation': {...}, 'caller': {...}, 'detail': {...}}."""
+        with self._lock:
+            result = {'wall_s': time.monotonic() - self._window_started}
+            result.update({group: {key: dict(stats) for key, stats in entries.items()} for group, entries in self._groups.items()})
+            if reset:
+                self._reset_window()
+        return result
+
+    def print_summary(self, reset=True, top=5):
+        summary = self.summary(reset=reset)
+        operations = summary['operation']
+        if not operations:
+            return
+        calls = sum(stats['calls'] for stats in operations.values())
+        request_s = sum(stats['ms'] for stats in operations.values()) / 1000
+        wait_s = sum(stats['wait_ms'] for stats in operations.values()) / 1000
+        print(f"\n⏱️  Network timings: {calls} requests, {request_s:.1f}s request time, {wait_s:.1f}s rate-limit wait over {summary['wall_s']:.1f}s")
+        print(f"   {'operation':<36} {'calls':>5} {'err':>4} {'retry':>5} {'total ms':>9} {'avg ms':>7} {'max ms':>7} {'wait ms':>8} {'KB out':>7} {'KB in':>8}")
+        for key, stats in sorted(operations.items(), key=lambda item: -item[1]['ms']):
+            print(f"   {key[:36]:<36} {stats['calls']:>5} {stats['errors']:>4} {stats['retries']:>5} {stats['ms']:>9.0f} "
+                  f"{stats['ms'] / stats['calls']:>7.0f} {stats['max_ms']:>7.0f} {stats['wait_ms']:>8.0f} {stats['bytes_out'] / 1024:>7.1f} {stats['bytes_in'] / 1024:>8.1f}")
+        for group, title in (('caller', 'By caller'), ('detail', 'Slowest games/slugs')):
+            entries = sorted(summary[group].items(), key=lambda item: -item[1]['ms'])[:top]
+            if entries:
+                print(f"   {title}: " + ", ".join(f"{key} {stats['ms']:.0f}ms/{stats['calls']}" for key, stats in entries))
+
+TELEMETRY = NetworkTelemetry(show_summary=os.environ.get(TIMINGS_ENV) == "1", log_path=os.environ.get(TIMINGS_LOG_ENV) or None)
+
+# TokenBucket: Process-wide client-side rate limit, so concurrent lookups and the daemon can't burst
+# enough requests from one IP to get Twitch throttling the account the miner is also using.
+# Callers reserve a token under the lock and sleep outside it, so waiters are served in arrival order.
+class TokenBucket:
+    def __init__(self, rate=RATE_LIMIT, burst=RATE_LIMIT_BURST):
+        self._lock = threading.Lock()
+        self.configure(rate, burst)
+
+    def configure(self, rate, burst=None):
+        """Change the rate (requests/second, 0 = unlimited) and burst; the bucket starts full."""
+        with self._lock:
+            self.rate = max(0.0, float(rate))
+            self.burst = max(1.0, float(burst if burst is not None else max(1.0, self.rate * 2)))
+            self.tokens = self.burst
+            self.updated = time.monotonic()
+
+    @staticmethod
+    def parse(value):
+        """(rate, burst) from "RATE" or "RATE/BURST"; burst is None when not given. Raises ValueError."""
+        rate, _, burst = str(value).partition("/")
+        rate = float(rate)
+        burst = float(burst) if burst else None
+        if rate < 0 or (burst is not None and burst < 1):
+            raise ValueError(f"invalid rate limit: {value}")
+        return rate, burst
+
+    def acquire(self):
+        """Take one token, sleeping until it is available. Returns the seconds waited."""
+        with self._lock:
+            if self.rate == 0:
+                return 0.0
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+def rate_limiter_from_env():
+    limiter = TokenBucket()
+    value = os.environ.get(RATE_LIMIT_ENV)
+    if value:
+        try:
+            limiter.configure(*TokenBucket.parse(value))
+        except ValueError:
+            print(f"⚠️  Ignoring {RATE_LIMIT_ENV}={value!r}; expected RATE or RATE/BURST")
+    return limiter
+
+RATE_LIMITER = rate_limiter_from_env()
+
+def network_caller():
+    """Name of the nearest function on the stack that isn't HTTP plumbing (GQLClient, DirectoryStreams, telemetry)."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        owner = frame.f_locals.get('self')
+        if frame.f_code.co_name not in ('network_caller', '<genexpr>', '<listcomp>') and not isinstance(owner, (NetworkTelemetry, GQLClient, DirectoryStreams)):
+            return frame.f_code.co_name
+        frame = frame.f_back
+    return None
+
+def describe_gql_payload(payload):
+    """(operation label, operation count, detail) of a GQL payload; detail is the slug/game name a lone operation is about."""
+    operations = payload if isinstance(payload, list) else [payload]
+    label = "+".join(dict.fromkeys(op.get('operationName') or 'query' for op in operations))
+    details = {(op.get('variables') or {}).get('slug') or (op.get('variables') or {}).get('name') for op in operations}
+    details.discard(None)
+    return label, len(operations), details.pop() if len(details) == 1 else None
+
+class GQLRequestError(Exception):
+    """A GQL request failed even after retries, as opposed to returning an empty result."""
+
+class CircuitOpenError(GQLRequestError):
+    """Raised instead of sending a request while the circuit breaker is open."""
+
+# CircuitBreaker: Fails requests fast once an endpoint has failed GQL_CIRCUIT_THRESHOLD times in a row,
+# so remaining lookups don't each wait out their own timeouts and retries. After the cooldown one trial
+# request is let through (half-open); its success closes the circuit, its failure reopens it.
+class CircuitBreaker:
+    def __init__(self, threshold=GQL_CIRCUIT_THRESHOLD, cooldown=GQL_CIRCUIT_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.open_until = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self.open_until == 0.0:
+                return "closed"
+            return "open" if time.monotonic() < self.open_until else "half-open"
+
+    def allow(self):
+        """True if a request may be sent now."""
+        with self._lock:
+            if self.open_until == 0.0:
+                return True
+            if time.monotonic() < self.open_until or self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.open_until = 0.0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial_in_flight or self.failures >= self.threshold:
+                self._open(self.cooldown)
+
+    def open_for(self, seconds):
+        """Open the circuit for at least `seconds`, e.g. when the server asks us to back off that long."""
+        with self._lock:
+            self._open(seconds)
+
+    def _open(self, seconds):
+        self.open_until = max(self.open_until, time.monotonic() + seconds)
+        self._trial_in_flight = False
+
+    def retry_in(self):
+        return max(0.0, self.open_until - time.monotonic())
+
+def backoff_delay(attempt, base=GQL_BACKOFF_BASE, cap=GQL_BACKOFF_MAX):
+    """Exponential backoff with jitter: half the step is fixed, half random, so retries don't line up."""
+    step = min(cap, base * (2 ** attempt))
+    return step / 2 + random.uniform(0, step / 2)
+
+def retry_after_seconds(response):
+    """Seconds from a Retry-After header (delta-seconds or HTTP date), or None."""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        from email.utils import parsedate_to_datetime
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+def transient_gql_error(response):
+    """True if every operation in a 200 response failed only with errors Twitch returns for momentary backend trouble."""
+    if b'"errors"' not in response.content:
+        return False
+    try:
+        data = response.json()
+    except ValueError:
+        return False
+    for result in (data if isinstance(data, list) else [data]):
+        errors = result.get('errors') if isinstance(result, dict) else None
+        if not errors or result.get('data'):
+            return False
+        messages = [str(error.get('message', '')).lower() for error in errors if isinstance(error, dict)]
+        if not messages or not all(any(marker in message for marker in GQL_TRANSIENT_ERRORS) for message in messages):
+            return False
+    return True
+
+# GQLClient: Owns one pooled keep-alive session to gql.twitch.tv so every fetch reuses the same connections.
+class GQLClient:
+    def __init__(self, timeout=GQL_TIMEOUT, pool_size=GQL_POOL_SIZE, batch_size=GQL_BATCH_SIZE, retries=GQL_RETRIES,
+                 circuit_breaker=None):
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.batch_size = batch_size
+        self.retries = retries
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.auth_headers = {}
+        self._session = None
+
+    @property
+    def session(self):
+        """Create the shared session on first use (headers are built once here)."""
+        if self._session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+            session.mount("https://", adapter)
+            session.headers.update({
+                'Client-Id': GQL_CLIENT_ID,
+                'Content-Type': 'application/json',
+                'User-Agent': USER_AGENT,
+            })
+            self._session = session
+        return self._session
+
+    def set_auth_cookies(self, auth_cookies):
+        """Build the Cookie/Authorization headers once from the miner's cookie dict."""
+        self.auth_headers = {}
+        if not auth_cookies:
+            return
+        self.auth_headers['Cookie'] = "; ".join([f"{name}={value}" for name, value in auth_cookies.items()])
+        if 'auth-token' in auth_cookies:
+            self.auth_headers['Authorization'] = f"OAuth {auth_cookies['auth-token']}"
+
+    @staticmethod
+    def operation(operation_name, variables=None):
+        """Build a persisted-query payload for a known operation."""
+        return {
+            "operationName": operation_name,
+            "variables": variables or {},
+            "extensions": {
+                "persistedQuery": {
+                    "version": 1,
+                    "sha256Hash": PERSISTED_QUERIES[operation_name]
+                }
+            }
+        }
+
+    def post(self, payload, auth=False, timeout=None, caller=None):
+        """
+        POST a payload to the GQL endpoint and return the raw response. Every attempt waits for RATE_LIMITER
+        (one token per HTTP request, however many operations it batches) and is recorded in TELEMETRY.
+        429/5xx responses, connection errors and transient GraphQL errors are retried with jittered
+        exponential backoff, honouring Retry-After. When retries run out the last response is returned
+        (or GQLRequestError raised for a connection error). While the circuit breaker is open, CircuitOpenError is
+        raised without sending anything. caller overrides the telemetry caller, for posts made from a helper thread.
+        """
+        headers = self.auth_headers if auth else None
+        body = json.dumps(payload).encode("utf-8")
+        operation, ops, detail = describe_gql_payload(payload)
+        breaker = self.circuit_breaker
+        for attempt in range(self.retries + 1):
+            if not breaker.allow():
+                raise CircuitOpenError(f"Twitch GQL is failing, not retrying for another {breaker.retry_in():.0f}s")
+            waited = RATE_LIMITER.acquire()
+            started = time.perf_counter()
+            try:
+                response = self.session.post(GQL_URL, data=body, headers=headers, timeout=timeout or self.timeout)
+            except requests.exceptions.RequestException as e:
+                TELEMETRY.record('gql', operation, started, bytes_out=len(body), retries=attempt, ops=ops, detail=detail, error=str(e),
+                                 waited=waited, caller=caller)
+                breaker.record_failure()
+                if attempt == self.retries:
+                    raise GQLRequestError(f"{operation}: {e}") from e
+                time.sleep(backoff_delay(attempt))
+                continue
+            
+            TELEMETRY.record('gql', operation, started, status=response.status_code, bytes_out=len(body),
+                             bytes_in=len(response.content), retries=attempt, ops=ops, detail=detail, waited=waited,
+                             caller=caller)
+            if response.status_code not in GQL_RETRY_STATUSES and not (response.status_code == 200 and transient_gql_error(response)):
+                breaker.record_success()
+                return response
+            
+            breaker.record_failure()
+            delay = retry_after_seconds(response)
+            if delay is not None and delay > GQL_RETRY_AFTER_MAX:
+                # Throttled for longer than is worth waiting: fail this and everything else fast until then
+                breaker.open_for(delay)
+                return response
+            if attempt == self.retries:
+                return response
+            time.sleep(delay if delay is not None else backoff_delay(attempt))
+        return response
+
+    def post_batch(self, payloads, auth=False, batch_size=None, timeout=None, caller=None):
+        """
+        Send independent operations as JSON arrays of up to batch_size operations each.
+        Returns one response dict per payload, in the same order. A failed chunk (HTTP error,
+        bad JSON, wrong result count) yields GraphQL-style {'errors': [...]} entries for just
+        the operations in that chunk.
+        """
+        batch_size = batch_size or self.batch_size
+        results = []
+        for i in range(0, len(payloads), batch_size):
+            chunk = payloads[i:i + batch_size]
+            try:
+                response = self.post(chunk, auth=auth, timeout=timeout, caller=caller)
+                if response.status_code != 200:
+                    results.extend(gql_error(f"HTTP {response.status_code}") for _ in chunk)
+                    continue
+                data = response.json()
+                if not isinstance(data, list) or len(data) != len(chunk):
+                    results.extend(gql_error("Malformed batch response") for _ in chunk)
+                    continue
+                results.extend(item if isinstance(item, dict) else gql_error("Malformed operation result") for item in data)
+            except Exception as e:
+                results.extend(gql_error(str(e)) for _ in chunk)
+        return results
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+def gql_error(message):
+    """A GraphQL-shaped error result, so batch failures look like any other error response."""
+    return {'errors': [{'message': message}]}
+
+# --- Discovery cache ---
+DISCOVERY_CACHE_FILE = os.path.join(CACHE_DIR, "discovery.json")
+DISCOVERY_SOURCES = ("campaigns", "rust_drops")
+DISCOVERY_CACHE_TTLS = {
+    "campaigns": 30 * 60,   # Inventory/Dashboard campaigns (seconds)
+    "rust_drops": 60 * 60,  # Facepunch drops page (seconds)
+}
+REFRESH_THREAD_NAME = "gibdrop-refresh"
+FACEPUNCH_DROPS_URL = "https://twitch.facepunch.com/#drops"
+FACEPUNCH_TIMEOUT = (5, 20)  # (connect, read) seconds
+# Seconds each discovery source may take before discovery carries on without it (Inventory and
+# Dashboard cover their GQL request; Facepunch covers the whole page fetch and parse)
+DISCOVERY_DEADLINES = {
+    "inventory": 15,
+    "dashboard": 15,
+    "facepunch": 20,
+}
+DISCOVERY_SOURCE_LABELS = {"inventory": "📋 Inventory", "dashboard": "🌐 Dashboard", "facepunch": "🦀 Facepunch"}
+FACEPUNCH_CACHE_FILE = os.path.join(CACHE_DIR, "facepunch.json")
+FACEPUNCH_CHUNK_SIZE = 16 * 1024
+COOKIE_FILE = None  # Pin the miner's cookie .pkl (or its cookies directory) to skip the search
+COOKIE_FILE_ENV = "GIBDROP_COOKIE_FILE"  # Same, from the environment; wins over COOKIE_FILE
+COOKIE_CACHE_FILE = os.path.join(CACHE_DIR, "twitch_cookies.json")  # Parsed cookies, valid while the .pkl is unchanged
+SLUG_CACHE_FILE = os.path.join(CACHE_DIR, "game_slugs.json")
+SLUG_CACHE_TTL = 30 * 24 * 60 * 60        # Slugs almost never change (seconds)
+SLUG_CACHE_NEGATIVE_TTL = 60 * 60         # Retry unknown game names after an hour (seconds)
+
+def write_json_atomic(path, data, mode=0o666):
+    """
+    Write JSON through a temp file and rename it into place so readers never see a partial file.
+    mode (before umask) applies when the file is created; use 0o600 for anything holding credentials.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    with open(tmp_path, "w", encoding="utf-8", opener=lambda p, flags: os.open(p, flags, mode)) as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+def write_text_if_changed(path, text, in_place=False):
+    """
+    Write text to path unless it already holds exactly that; returns True if the file was written.
+    Writes go through a temp file and rename, except with in_place: a file bind-mounted on its own
+    into the miner container (gibdrop_dockermgr.TXT_FILES) must keep its inode, or the container
+    goes on seeing the old file. Those are rewritten with a single write instead.
+    """
+    try:
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            if f.read() == text:
+                return False
+    except (OSError, UnicodeDecodeError):
+        pass
+    if in_place:
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        return True
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+    return True
+
+def mounted_in_container(path):
+    """True if path is one of the streamer files bind-mounted individually into the miner container."""
+    return os.path.normpath(path) in gibdrop_dockermgr.TXT_FILES
+
+# DiscoveryCache: On-disk snapshot of discovery results, one entry per source with its own TTL.
+class DiscoveryCache:
+    def __init__(self, path=DISCOVERY_CACHE_FILE, ttls=None):
+        self.path = path
+        self.ttls = ttls or dict(DISCOVERY_CACHE_TTLS)
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, source):
+        """Return (value, fetched_at, is_fresh) for a source, or (None, None, False) if nothing is cached."""
+        with self._lock:
+            entry = self._load().get(source)
+        if not isinstance(entry, dict) or 'value' not in entry:
+            return None, None, False
+        fetched_at = entry.get('fetched_at', 0)
+        is_fresh = time.time() - fetched_at < self.ttls.get(source, 0)
+        return entry['value'], fetched_at, is_fresh
+
+    def put(self, source, value):
+        with self._lock:
+            data = self._load()
+            data[source] = {'fetched_at': time.time(), 'value': value}
+            try:
+                write_json_atomic(self.path, data)
+            except OSError as e:
+                print(f"⚠️  Could not write discovery cache {self.path}: {e}")
+
+# SlugCache: Persistent game name -> directory slug index, including short-lived "no such game" entries.
+class SlugCache:
+    def __init__(self, path=SLUG_CACHE_FILE, ttl=SLUG_CACHE_TTL, negative_ttl=SLUG_CACHE_NEGATIVE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries = None
+        self._lock = threading.Lock()
+
+    def _ensure_loaded(self):
+        if self._entries is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    entries = json.load(f)
+                self._entries = entries if isinstance(entries, dict) else {}
+            except (OSError, ValueError):
+                self._entries = {}
+
+    def lookup(self, game_name):
+        """Return (found, slug). slug is None for a cached negative result; found is False on a miss or expiry."""
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._entries.get(game_name.lower())
+        if not isinstance(entry, dict):
+            return False, None
+        slug = entry.get('slug')
+        ttl = self.ttl if slug else self.negative_ttl
+        if time.time() - entry.get('fetched_at', 0) >= ttl:
+            return False, None
+        return True, slug
+
+    def update(self, slugs):
+        """Store {game_name: slug_or_None} and persist the index."""
+        if not slugs:
+            return
+        now = time.time()
+        with self._lock:
+            self._ensure_loaded()
+            for game_name, slug in slugs.items():
+                self._entries[game_name.lower()] = {'slug': slug, 'fetched_at': now}
+            try:
+                write_json_atomic(self.path, self._entries)
+            except OSError as e:
+                print(f"⚠️  Could not write slug cache {self.path}: {e}")
+
+# FacepunchDropsParser: Incremental extractor for the Facepunch drops page. It tracks only the
+# .event-date, .streamer-drops and #drops title elements and reports when all of them are complete.
+class FacepunchDropsParser(HTMLParser):
+    VOID_ELEMENTS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param", "source", "track", "wbr"}
+    TIMESTAMP_PATTERN = re.compile(r'new Date\((\d+)\)')
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.stack = []  # [tag, role] for every open element
+        self.seen = set()  # roles whose first matching element has been opened
+        self.closed = set()  # roles whose first matching element has been closed
+        self.event_date_text = []
+        self.streamers = []
+        self.streamer_drops = 0
+        self.title_text = []
+        self._name_parts = None
+
+    @property
+    def done(self):
+        """True once every section get_rust_drops reads has been fully parsed."""
+        return {"event-date", "streamer-drops", "drops-title"} <= self.closed
+
+    def _inside(self, role):
+        return any(open_role == role for _, open_role in self.stack)
+
+    def _role_for(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = (attrs.get("class") or "").split()
+        if tag == "div":
+            if "event-date" in classes and "event-date" not in self.seen:
+                return "event-date"
+            if "streamer-drops" in classes and "streamer-drops" not in self.seen:
+                return "streamer-drops"
+            if attrs.get("id") == "drops" and attrs.get("class") == "section drops" and "drops" not in self.seen:
+                return "drops"
+            if "drop-box" in classes and self._inside("streamer-drops"):
+                return "drop-box"
+        elif tag == "span" and "streamer-name" in classes and self._inside("streamer-drops"):
+            return "streamer-name"
+        elif tag == "h1" and "title" in classes and self._inside("drops") and "drops-h1" not in self.seen:
+            return "drops-h1"
+        elif tag == "span" and self._inside("drops-h1") and "drops-title" not in self.seen:
+            return "drops-title"
+        return None
+
+    def handle_starttag(self, tag, attrs):
+        role = self._role_for(tag, attrs)
+        if role:
+            self.seen.add(role)
+            if role == "drop-box":
+                self.streamer_drops += 1
+            elif role == "streamer-name" and self._name_parts is None:
+                self._name_parts = []
+        if self._inside("event-date") or role == "event-date":
+            self.event_date_text.append(self.get_starttag_text() or "")
+        if tag in self.VOID_ELEMENTS:
+            return
+        self.stack.append([tag, role])
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in self.VOID_ELEMENTS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        # Like BeautifulSoup, close the most recent open element with this name and ignore stray end tags
+        for index in range(len(self.stack) - 1, -1, -1):
+            if self.stack[index][0] == tag:
+                break
+        else:
+            return
+        for _, role in reversed(self.stack[index:]):
+            if role == "streamer-name" and self._name_parts is not None:
+                self.streamers.append("".join(self._name_parts))
+                self._name_parts = None
+            if role:
+                self.closed.add(role)
+        del self.stack[index:]
+
+    def handle_data(self, data):
+        if self._inside("event-date"):
+            self.event_date_text.append(data)
+        if self._name_parts is not None:
+            # Matches get_text(strip=True): strip every text fragment and join them
+            self._name_parts.append(data.strip())
+        if self._inside("drops-title"):
+            self.title_text.append(data.strip())
+
+    def result(self):
+        """The parse in the same shape as StreamerManager._parse_rust_drops_page."""
+        if self._name_parts is not None:
+            self.streamers.append("".join(self._name_parts))
+            self._name_parts = None
+        general_drops = 0
+        if "drops-title" in self.seen:
+            try:
+                general_drops = int("".join(self.title_text).strip('()'))
+            except ValueError:
+                general_drops = 0
+        return {
+            'timestamps': [int(ts) for ts in self.TIMESTAMP_PATTERN.findall("".join(self.event_date_text))],
+            'streamers': self.streamers if "streamer-drops" in self.seen else None,
+            'streamer_drops': self.streamer_drops,
+            'general_drops': general_drops,
+        }
+
+def parse_rust_drops_stream(chunks, encoding="utf-8"):
+    """
+    Feed byte chunks through FacepunchDropsParser and stop as soon as every needed section is parsed.
+    Returns (parsed, bytes_read, sha256_of_bytes_read).
+    """
+    parser = FacepunchDropsParser()
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    digest = hashlib.sha256()
+    bytes_read = 0
+    for chunk in chunks:
+        if not chunk:
+            continue
+        bytes_read += len(chunk)
+        digest.update(chunk)
+        parser.feed(decoder.decode(chunk))
+        if parser.done:
+            break
+    else:
+        parser.feed(decoder.decode(b"", final=True))
+        parser.close()
+    return parser.result(), bytes_read, digest.hexdigest()
+
+def run_with_deadlines(tasks, deadlines):
+    """
+    Run {name: callable} concurrently, each on its own daemon thread, and wait for each until its
+    deadline in seconds from now (None = no deadline). Returns ({name: Future}, [timed-out names]).
+    A blocking HTTP request can't be cancelled, so a timed-out call keeps running with its output
+    muted and its result dropped. Threads are named after the caller so a background refresh stays quiet.
+    """
+    from concurrent.futures import Future, wait
+    started = time.monotonic()
+    running = {}
+    for name, call in tasks.items():
+        future = Future()
+        
+        def run(call=call, future=future):
+            try:
+                future.set_result(call())
+            except BaseException as e:
+                future.set_exception(e)
+        
+        thread = threading.Thread(target=run, name=f"{threading.current_thread().name}-{name}", daemon=True)
+        thread.start()
+        running[name] = (future, thread)
+    
+    finished, timed_out = {}, []
+    for name, (future, thread) in running.items():
+        deadline = deadlines.get(name)
+        remaining = None if deadline is None else max(0.0, started + deadline - time.monotonic())
+        wait([future], timeout=remaining)
+        if future.done():
+            finished[name] = future
+            continue
+        timed_out.append(name)
+        thread.name = f"{REFRESH_THREAD_NAME}-late-{name}"
+        if not isinstance(sys.stdout, QuietRefreshStdout):
+            sys.stdout = QuietRefreshStdout(sys.stdout)
+    return finished, timed_out
+
+# QuietRefreshStdout: Drops output from background refresh threads so it doesn't scribble over the campaign browser.
+class QuietRefreshStdout:
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, text):
+        if threading.current_thread().name.startswith(REFRESH_THREAD_NAME):
+            return len(text)
+        return self.stream.write(text)
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+def directory_variables(slug, limit, cursor=None, system_filters=None):
+    """Variables for a DirectoryPage_Game query sorted by viewer count."""
+    return {
+        "limit": limit,
+        "cursor": cursor,
+        "slug": slug,
+        "imageWidth": 50,
+        "includeIsDJ": False,
+        "options": {
+            "broadcasterLanguages": [],
+            "freeformTags": None,
+            "includeRestricted": ["SUB_ONLY_LIVE"],
+            "recommendationsContext": {"platform": "web"},
+            "sort": "VIEWER_COUNT",  # Sort by viewers for best streamers
+            "systemFilters": system_filters or [],  # ["DROPS_ENABLED"] is the key filter for drops
+            "tags": [],
+            "requestID": "JIRA-VXP-2397",
+        },
+        "sortTypeIsRecency": False,
+    }
+
+# DirectoryStreams: Lazily paginated DirectoryPage_Game results that follow the cursor on each edge.
+# Pages are only requested while the caller keeps iterating, so stopping early saves the remaining requests.
+class DirectoryStreams:
+    def __init__(self, gql, slug, page_size=DIRECTORY_PAGE_SIZE, system_filters=("DROPS_ENABLED",), max_pages=None):
+        self.gql = gql
+        self.slug = slug
+        self.page_size = page_size
+        self.system_filters = list(system_filters)
+        self.max_pages = max_pages
+        self.pages_fetched = 0
+        self.has_more = True  # False once the directory is known to be exhausted
+        self.total_count = None  # Server-side total, when the response carries one
+        self.error = None
+
+    def pages(self):
+        """Yield the stream nodes of each directory page as it arrives."""
+        cursor = None
+        while self.max_pages is None or self.pages_fetched < self.max_pages:
+            directory_query = self.gql.operation(
+                "DirectoryPage_Game",
+                directory_variables(self.slug, self.page_size, cursor, self.system_filters),
+            )
+            
+            response = self.gql.post(directory_query)
+            if response.status_code != 200:
+                self.error = f"HTTP {response.status_code}"
+                print(f"      Failed to fetch drops-enabled streamers: HTTP {response.status_code}")
+                return
+            
+            try:
+                data = response.json()
+            except ValueError:
+                self.error = "Invalid JSON"
+                print(f"      Failed to parse JSON response")
+                return
+            
+            # Check for GraphQL errors
+            if 'errors' in data:
+                self.error = str(data['errors'])
+                print(f"      GraphQL errors: {data['errors']}")
+                return
+            
+            # Navigate through the response structure carefully
+            game_data = (data.get('data') or {}).get('game')
+            if not game_data:
+                self.has_more = False
+                print(f"      No game data in response")
+                return
+            
+            streams_data = game_data.get('streams') or {}
+            edges = streams_data.get('edges') or []
+            if isinstance(streams_data.get('totalCount'), int):
+                self.total_count = streams_data['totalCount']
+            self.pages_fetched += 1
+            if not edges:
+                self.has_more = False
+                return
+            
+            # Follow the real cursor from the last edge; stop when Twitch says there is nothing further
+            cursor = edges[-1].get('cursor')
+            has_next_page = (streams_data.get('pageInfo') or {}).get('hasNextPage')
+            if has_next_page is None:
+                has_next_page = len(edges) >= self.page_size
+            self.has_more = bool(cursor) and has_next_page
+            
+            yield [edge.get('node') or {} for edge in edges]
+            
+            if not self.has_more:
+                return
+
+    def __iter__(self):
+        for page in self.pages():
+            yield from page
+
+# Campaign: One drop campaign from the Inventory, the ViewerDropsDashboard or the Facepunch page.
+# Slotted because the browser holds hundreds of them; campaign_id is its identity everywhere
+# (merging sources, selection, --campaign filters), never the name or the whole record.
+class Campaign:
+    __slots__ = ('campaign_id', 'name', 'game', 'slug', 'type', 'status', 'streamers', 'fetched_streamer_count',
+                 'more_streamers', 'total_viewers', 'start_time', 'end_time', 'details_url', 'image_url',
+                 'drops_count', 'streamer_drops', 'general_drops', 'lookup_failed', 'stream_stats',
+                 'minutes_remaining', 'drops_remaining', 'drops_unreachable')
+
+    def __init__(self, campaign_id, name, game, type, slug='', status='ACTIVE', streamers=None, fetched_streamer_count=None,
+                 more_streamers=False, total_viewers=0, start_time='', end_time='', details_url='', image_url='',
+                 drops_count=0, streamer_drops=0, general_drops=0, lookup_failed=False, stream_stats=None,
+                 minutes_remaining=None, drops_remaining=None, drops_unreachable=0):
+        self.campaign_id = campaign_id
+        self.name = name
+        self.game = game
+        self.type = type
+        self.slug = slug
+        self.status = status
+        self.streamers = list(streamers or [])
+        self.fetched_streamer_count = len(self.streamers) if fetched_streamer_count is None else fetched_streamer_count
+        self.more_streamers = more_streamers
+        self.total_viewers = total_viewers
+        self.start_time = start_time
+        self.end_time = end_time
+        self.details_url = details_url
+        self.image_url = image_url
+        self.drops_count = drops_count
+        self.streamer_drops = streamer_drops
+        self.general_drops = general_drops
+        self.lookup_failed = lookup_failed
+        self.stream_stats = dict(stream_stats or {})  # streamer -> {'viewers', 'started_at'} from the directory, if looked up
+        # Watch-time progress from the Inventory (see campaign_drop_progress); None where Twitch doesn't report it
+        self.minutes_remaining = minutes_remaining
+        self.drops_remaining = drops_remaining
+        self.drops_unreachable = drops_unreachable
+
+    @property
+    def streamer_count(self):
+        return len(self.streamers)
+
+    @property
+    def is_rust(self):
+        return self.type == 'RUST_DROPS'
+
+    @property
+    def has_progress(self):
+        return self.drops_remaining is not None
+
+    @property
+    def earnable(self):
+        """False once every watch-time drop is claimed or can no longer finish before it ends."""
+        return not self.has_progress or self.drops_remaining > 0
+
+    @property
+    def priority(self):
+        """Sort key: earnable campaigns closest to their next drops first, then those without progress data, unearnable last."""
+        return (not self.earnable, not self.has_progress, self.minutes_remaining or 0)
+
+    def progress_summary(self):
+        """One line about watch-time progress for the browser, or None without progress data."""
+        if not self.has_progress:
+            return None
+        unreachable = f", {self.drops_unreachable} can't finish in time" if self.drops_unreachable else ""
+        if self.drops_remaining:
+            return f"⏳ {format_minutes(self.minutes_remaining)} of watching left for {self.drops_remaining} drop{'s' if self.drops_remaining != 1 else ''}{unreachable}"
+        if self.drops_unreachable:
+            return f"⛔ Can't finish before it ends ({self.drops_unreachable} drop{'s' if self.drops_unreachable != 1 else ''} out of reach)"
+        return "✅ All drops claimed"
+
+    def set_streamers(self, streamers, fetched_count=None, more=False, viewers=0, stream_stats=None):
+        self.streamers = list(streamers)
+        self.fetched_streamer_count = len(self.streamers) if fetched_count is None else fetched_count
+        self.more_streamers = more
+        self.total_viewers = viewers
+        self.stream_stats = dict(stream_stats or {})
+
+    def copy_streamers_from(self, other):
+        self.set_streamers(other.streamers, other.fetched_streamer_count, other.more_streamers, other.total_viewers, other.stream_stats)
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a cached campaign; unknown keys (from older gibdrop versions) are ignored."""
+        fields = {field: data[field] for field in cls.__slots__ if field in data}
+        fields['campaign_id'] = fields.get('campaign_id') or f"name:{data['name']}"
+        return cls(**fields)
+
+    def __repr__(self):
+        return f"Campaign({self.campaign_id!r}, {self.name!r}, {self.game!r}, {len(self.streamers)} streamers)"
+
+def unique_campaigns(campaigns):
+    """campaigns without repeated campaign_ids, keeping the first (highest priority) occurrence."""
+    seen = set()
+    unique = []
+    for campaign in campaigns:
+        if campaign.campaign_id not in seen:
+            seen.add(campaign.campaign_id)
+            unique.append(campaign)
+    return unique
+
+def campaign_drop_progress(drops, campaign_end=None, now=None):
+    """
+    (minutes_remaining, drops_remaining, drops_unreachable) from a campaign's timeBasedDrops, or
+    (None, None, 0) if it has no watch-time drops. Watch time counts toward every unclaimed drop at
+    once, so the campaign needs the largest remaining requirement among the drops that can still
+    finish before their endAt (falling back to the campaign's); the others are unreachable.
+    """
+    now = now or datetime.now(timezone.utc)
+    remaining = []
+    unreachable = 0
+    watch_drops = 0
+    for drop in drops or []:
+        required = drop.get('requiredMinutesWatched') or 0
+        if required <= 0:
+            continue  # Subscription/event drops don't depend on watch time
+        watch_drops += 1
+        progress = drop.get('self') or {}
+        if progress.get('isClaimed'):
+            continue
+        minutes = max(0, required - (progress.get('currentMinutesWatched') or 0))
+        end = parse_twitch_time(drop.get('endAt')) or parse_twitch_time(campaign_end)
+        if end and (end - now).total_seconds() / 60 < minutes:
+            unreachable += 1
+            continue
+        remaining.append(minutes)
+    if not watch_drops:
+        return None, None, 0
+    return max(remaining, default=0), len(remaining), unreachable
+
+def format_minutes(minutes):
+    hours, minutes = divmod(int(minutes), 60)
+    return f"{hours}h {minutes:02d}m" if hours else f"{minutes}m"
+
+def stream_stats_from_node(node):
+    """Viewer count and start time of a directory stream node (the start time only if the response has one)."""
+    return {'viewers': node.get('viewersCount') or 0, 'started_at': node.get('createdAt')}
+
+def stream_score(stats, now):
+    """
+    How good a watch slot a live stream is: log viewers (big streams rarely end abruptly), rounded to
+    half-steps so normal viewer drift between refreshes doesn't reshuffle the list, and discounted once
+    the stream has been live longer than STREAM_AGE_SOFT_LIMIT.
+    """
+    score = round(math.log10(1 + (stats.get('viewers') or 0)) * 2) / 2
+    started_at = parse_twitch_time(stats.get('started_at'))
+    if started_at:
+        age = (now - started_at).total_seconds()
+        if age > STREAM_AGE_SOFT_LIMIT:
+            score *= STREAM_AGE_SOFT_LIMIT / age
+    return score
+
+def rank_streamers(campaigns, now=None):
+    """
+    One de-duplicated streamer list for the selected campaigns, best watch slots first. The miner
+    only watches a couple of channels at a time, in list order, so the order decides where watch time goes:
+    1. streamers listed by more campaigns (one watch-minute progresses all of them),
+    2. campaign order (campaigns come in priority order, Rust drops first), by the first campaign listing the streamer,
+    3. within a campaign, streamers seen live in the directory by stream_score(), ahead of those without
+       live data (Facepunch and campaign-listed streamers), which the miner skips while they are offline anyway,
+    4. original order, for ties.
+    Names are matched case-insensitively; the first spelling is kept.
+    """
+    now = now or datetime.now(timezone.utc)
+    first_seen = {}
+    campaign_rank = {}
+    coverage = {}
+    scores = {}
+    for rank, campaign in enumerate(campaigns):
+        for name in dict.fromkeys(campaign.streamers):
+            key = name.lower()
+            first_seen.setdefault(key, (len(first_seen), name))
+            campaign_rank.setdefault(key, rank)
+            coverage[key] = coverage.get(key, 0) + 1
+            stats = campaign.stream_stats.get(name)
+            if stats:
+                scores[key] = max(scores.get(key, 0.0), stream_score(stats, now))
+    ranked = sorted(first_seen, key=lambda key: (-coverage[key], campaign_rank[key], key not in scores,
+                                                 -scores.get(key, 0.0), first_seen[key][0]))
+    return [first_seen[key][1] for key in ranked]
+
 # StreamerManager: Handles loading, saving, and fetching streamer lists (default, drop, active) for the Twitch miner.
 class StreamerManager:
-    def get_rust_drops(self):
-        url = "https://twitch.facepunch.com/#drops"
-        response = requests.get(url)
-        html = response.text
+    def __init__(self, gql_client=None, discovery_workers=DISCOVERY_WORKERS, discovery_cache=None, slug_cache=None,
+                 count_streamers=DIRECTORY_COUNT_MODE):
+        self.gql = gql_client or GQLClient()
+        self.discovery_workers = discovery_workers
+        self.count_streamers = count_streamers
+        self.discovery_cache = discovery_cache or DiscoveryCache()
+        self.slug_cache = slug_cache or SlugCache()
+        self._refresh_thread = None
+        self._refresh_results = None
+        self._auth_cookies = None  # Cookie cache entry: {'source', 'mtime_ns', 'size', 'cookies'}
+        self.timed_out_sources = []  # DISCOVERY_DEADLINES keys that missed their deadline in the last refresh
+        self.failed_sources = []  # DISCOVERY_DEADLINES keys whose request failed outright in the last refresh
+        self.upcoming_campaign_starts = []  # startAt of UPCOMING Twitch campaigns, for the daemon's poll schedule
+
+    def _load_facepunch_cache(self):
+        try:
+            with open(FACEPUNCH_CACHE_FILE, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            return cached if isinstance(cached, dict) and 'parsed' in cached else None
+        except (OSError, ValueError):
+            return None
+
+    def _fetch_rust_drops_page(self):
+        """
+        Fetch and parse the Facepunch drops page, revalidating against the last fetch.
+        Sends If-None-Match/If-Modified-Since from the stored validators and reuses the stored
+        parse result on a 304. Otherwise the body is parsed as it streams in and the download
+        stops once the needed sections are read; the hash covers the bytes actually read.
+        """
+        cached = self._load_facepunch_cache()
+        headers = {'User-Agent': USER_AGENT}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+        
+        waited = RATE_LIMITER.acquire()
+        started = time.perf_counter()
+        try:
+            response = requests.get(FACEPUNCH_DROPS_URL, headers=headers, timeout=FACEPUNCH_TIMEOUT, stream=True)
+        except Exception as e:
+            TELEMETRY.record('http', 'GET facepunch drops', started, error=str(e), waited=waited)
+            raise
+        bytes_read = 0
+        try:
+            if response.status_code == 304 and cached:
+                print("    ♻️  Facepunch drops page unchanged (304), reusing last parse")
+                return cached['parsed']
+            
+            parsed, bytes_read, body_hash = parse_rust_drops_stream(
+                response.iter_content(chunk_size=FACEPUNCH_CHUNK_SIZE), response.encoding or "utf-8"
+            )
+        finally:
+            # Closing early drops the rest of the page we didn't need
+            response.close()
+            # Timed through the streamed parse, bytes_in is what was actually downloaded
+            TELEMETRY.record('http', 'GET facepunch drops', started, status=response.status_code, bytes_in=bytes_read, waited=waited)
+        
+        if cached and cached.get('body_hash') == body_hash:
+            print("    ♻️  Facepunch drops page content unchanged, reusing last parse")
+            parsed = cached['parsed']
+        
+        if response.status_code == 200:
+            try:
+                write_json_atomic(FACEPUNCH_CACHE_FILE, {
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                    'body_hash': body_hash,
+                    'parsed': parsed,
+                })
+            except OSError as e:
+                print(f"    ⚠️  Could not write Facepunch cache: {e}")
+        return parsed
+
+    def _parse_rust_drops_page(self, html):
+        """
+        Extract everything get_rust_drops needs from the Facepunch page into a JSON-friendly dict:
+        event-date timestamps (ms), streamer names (None if the section is missing),
+        drop-box count and the general drops count from the #drops title.
+        This is the full BeautifulSoup reference parse; fetches use the streaming FacepunchDropsParser.
+        """
+        from bs4 import BeautifulSoup
         soup = BeautifulSoup(html, "html.parser")
+        parsed = {'timestamps': [], 'streamers': None, 'streamer_drops': 0, 'general_drops': 0}
+        
+        event_date_div = soup.find('div', class_='event-date')
+        if event_date_div:
+            # Look for JavaScript timestamp patterns: new Date(1234567890000)
+            timestamp_pattern = r'new Date\((\d+)\)'
+            parsed['timestamps'] = [int(ts) for ts in re.findall(timestamp_pattern, str(event_date_div))]
+        
+        streamer_drops_div = soup.find('div', class_='streamer-drops')
+        if streamer_drops_div:
+            streamer_names_spans = streamer_drops_div.find_all('span', class_='streamer-name')
+            parsed['streamers'] = [span.get_text(strip=True) for span in streamer_names_spans]
+            
+            # Count unique streamer drops using drop-box containers
+            # Each drop-box represents one unique drop item (teams count as 1 drop)
+            parsed['streamer_drops'] = len(streamer_drops_div.find_all('div', class_='drop-box'))
+        
+        # Get general drops count
+        drops_div = soup.find('div', id='drops', class_='section drops')
+        if drops_div:
+            h1_title = drops_div.find('h1', class_='title')
+            if h1_title:
+                span = h1_title.find('span')
+                if span:
+                    text = span.get_text(strip=True)
+                    try:
+                        parsed['general_drops'] = int(text.strip('()'))
+                    except ValueError:
+                        parsed['general_drops'] = 0
+        return parsed
+
+    def get_rust_drops(self):
+        parsed = self._fetch_rust_drops_page()
         
         # Extract campaign dates from the event-date section
         campaign_start = None
         campaign_end = None
         is_active = False
         
-        event_date_div = soup.find('div', class_='event-date')
-        if event_date_div:
-            # Look for JavaScript timestamp patterns: new Date(1234567890000)
-            timestamp_pattern = r'new Date\((\d+)\)'
-            timestamps = re.findall(timestamp_pattern, str(event_date_div))
+        timestamps = parsed.get('timestamps', [])
+        if len(timestamps) >= 2:
+            # Convert JavaScript timestamps (milliseconds) to Python timestamps (seconds)
+            start_timestamp = int(timestamps[0]) / 1000
+            end_timestamp = int(timestamps[1]) / 1000
             
-            if len(timestamps) >= 2:
-                # Convert JavaScript timestamps (milliseconds) to Python timestamps (seconds)
-                start_timestamp = int(timestamps[0]) / 1000
-                end_timestamp = int(timestamps[1]) / 1000
-                
-                campaign_start = datetime.fromtimestamp(start_timestamp, tz=timezone.utc)
-                campaign_end = datetime.fromtimestamp(end_timestamp, tz=timezone.utc)
-                
-                # Check if campaign is currently active
-                now = datetime.now(timezone.utc)
-                is_active = campaign_start <= now <= campaign_end
-                
-                print(f"    📅 Rust drops campaign: {campaign_start.strftime('%Y-%m-%d %H:%M UTC')} - {campaign_end.strftime('%Y-%m-%d %H:%M UTC')}")
-                if is_active:
-                    print(f"    ✅ Campaign is currently ACTIVE")
-                elif now < campaign_start:
-                    print(f"    ⏳ Campaign starts in {campaign_start - now}")
-                else:
-                    print(f"    ❌ Campaign ended {now - campaign_end} ago")
+            campaign_start = datetime.fromtimestamp(start_timestamp, tz=timezone.utc)
+            campaign_end = datetime.fromtimestamp(end_timestamp, tz=timezone.utc)
+            
+            # Check if campaign is currently active
+            now = datetime.now(timezone.utc)
+            is_active = campaign_start <= now <= campaign_end
+            
+            print(f"    📅 Rust drops campaign: {campaign_start.strftime('%Y-%m-%d %H:%M UTC')} - {campaign_end.strftime('%Y-%m-%d %H:%M UTC')}")
+            if is_active:
+                print(f"    ✅ Campaign is currently ACTIVE")
+            elif now < campaign_start:
+                print(f"    ⏳ Campaign starts in {campaign_start - now}")
+            else:
+                print(f"    ❌ Campaign ended {now - campaign_end} ago")
         
-        # Only fetch streamers if campaign is active or no date info found (fallback)
+        # Only use streamers if campaign is active or no date info found (fallback)
         if is_active or campaign_start is None:
-            streamer_drops_div = soup.find('div', class_='streamer-drops')
-            if not streamer_drops_div:
+            if parsed.get('streamers') is None:
                 print("    ⚠️  Streamer drops section not found!")
                 return [], 0, 0, campaign_start, campaign_end, is_active
             
-            streamer_names_spans = streamer_drops_div.find_all('span', class_='streamer-name')
-            rust_streamer_names = [span.get_text(strip=True) for span in streamer_names_spans]
-            
-            # Count unique streamer drops using drop-box containers
-            # Each drop-box represents one unique drop item (teams count as 1 drop)
-            drop_boxes = streamer_drops_div.find_all('div', class_='drop-box')
-            streamer_drops_count = len(drop_boxes)
-            
-            # Get general drops count
-            general_drops_count = 0
-            drops_div = soup.find('div', id='drops', class_='section drops')
-            if drops_div:
-                h1_title = drops_div.find('h1', class_='title')
-                if h1_title:
-                    span = h1_title.find('span')
-                    if span:
-                        text = span.get_text(strip=True)
-                        try:
-                            general_drops_count = int(text.strip('()'))
-                        except ValueError:
-                            general_drops_count = 0
-            
             # Return separate counts for display formatting
-            return rust_streamer_names, streamer_drops_count, general_drops_count, campaign_start, campaign_end, is_active
+            return parsed['streamers'], parsed.get('streamer_drops', 0), parsed.get('general_drops', 0), campaign_start, campaign_end, is_active
         else:
             print(f"    ⚠️  Campaign not active, skipping streamer fetch")
             return [], 0, 0, campaign_start, campaign_end, is_active
@@ -187,11 +1366,15 @@ class StreamerManager:
             try:
                 drops_url = "https://www.twitch.tv/drops/campaigns"
                 headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+                    'User-Agent': USER_AGENT
                 }
                 
+                waited = RATE_LIMITER.acquire()
+                started = time.perf_counter()
                 response = requests.get(drops_url, headers=headers)
+                TELEMETRY.record('http', 'GET twitch drops page', started, status=response.status_code, bytes_in=len(response.content), waited=waited)
                 if response.status_code == 200:
+                    from bs4 import BeautifulSoup
                     soup = BeautifulSoup(response.text, "html.parser")
                     
                     # Look for campaign data in script tags or data attributes
@@ -209,80 +1392,33 @@ class StreamerManager:
                 popular_games = ["Rust", "Counter-Strike 2", "VALORANT", "World of Warcraft", 
                                "League of Legends", "Apex Legends", "Fortnite", "Escape from Tarkov"]
                 
-                url = "https://gql.twitch.tv/gql"
-                headers = {
-                    'Client-Id': 'kimne78kx3ncx6brgo4mv6wki5h1ko',
-                    'Content-Type': 'application/json',
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-                }
+                # First resolve every game slug (cached, misses in one batched request)
+                resolved = self.resolve_game_slugs(popular_games)
+                game_slugs = {game: slug for game, slug in resolved.items() if slug}
+                
+                # Now get channels for every resolved game in one batched request
+                directory_queries = [self.gql.operation("DirectoryPage_Game", directory_variables(slug, 50)) for slug in game_slugs.values()]
+                directory_results = self.gql.post_batch(directory_queries)
                 
-                for game in popular_games:
+                for game, data in zip(game_slugs, directory_results):
                     try:
-                        # First get the game slug
-                        slug_query = {
-                            "operationName": "DirectoryGameRedirect",
-                            "variables": {"name": game},
-                            "extensions": {
-                                "persistedQuery": {
-                                    "version": 1,
-                                    "sha256Hash": "1f0300090caceec51f33c5e20647aceff9017f740f223c3c532ba6fa59f6b6cc"
-                                }
-                            }
-                        }
+                        if 'errors' in data:
+                            print(f"Failed to fetch streamers for {game}: {data['errors']}")
+                            continue
+                        streams = data.get('data', {}).get('game', {}).get('streams', {}).get('edges', [])
                         
-                        response = requests.post(url, json=slug_query, headers=headers)
-                        if response.status_code == 200:
-                            data = response.json()
-                            game_data = data.get('data', {}).get('game')
-                            if game_data and game_data.get('slug'):
-                                slug = game_data['slug']
-                                
-                                # Now get channels for this game
-                                directory_query = {
-                                    "operationName": "DirectoryPage_Game",
-                                    "variables": {
-                                        "limit": 50,
-                                        "slug": slug,
-                                        "imageWidth": 50,
-                                        "includeIsDJ": False,
-                                        "options": {
-                                            "broadcasterLanguages": [],
-                                            "freeformTags": None,
-                                            "includeRestricted": ["SUB_ONLY_LIVE"],
-                                            "recommendationsContext": {"platform": "web"},
-                                            "sort": "VIEWER_COUNT",
-                                            "systemFilters": [],
-                                            "tags": [],
-                                            "requestID": "JIRA-VXP-2397",
-                                        },
-                                        "includeIsDJ": False,
-                                        "sortTypeIsRecency": False,
-                                    },
-                                    "extensions": {
-                                        "persistedQuery": {
-                                            "version": 1,
-                                            "sha256Hash": "c7c9d5aad09155c4161d2382092dc44610367f3536aac39019ec2582ae5065f9"
-                                        }
-                                    }
-                                }
-                                
-                                response = requests.post(url, json=directory_query, headers=headers)
-                                if response.status_code == 200:
-                                    data = response.json()
-                                    streams = data.get('data', {}).get('game', {}).get('streams', {}).get('edges', [])
-                                    
-                                    game_streamers = []
-                                    for stream in streams:
-                                        node = stream.get('node', {})
-                                        broadcaster = node.get('broadcaster')
-                                        if broadcaster and broadcaster.get('displayName'):
-                                            streamer_name = broadcaster['displayName']
-                                            all_streamers.add(streamer_name)
-                                            game_streamers.append(streamer_name)
-                                    
-                                    if game_streamers:
-                                        campaign_info[game] = game_streamers
-                                        print(f"Found {len(game_streamers)} streamers for {game}")
+                        game_streamers = []
+                        for stream in streams:
+                            node = stream.get('node', {})
+                            broadcaster = node.get('broadcaster')
+                            if broadcaster and broadcaster.get('displayName'):
+                                streamer_name = broadcaster['displayName']
+                                all_streamers.add(streamer_name)
+                                game_streamers.append(streamer_name)
+                        
+                        if game_streamers:
+                            campaign_info[game] = game_streamers
+                            print(f"Found {len(game_streamers)} streamers for {game}")
                     
                     except Exception as e:
                         print(f"Failed to fetch streamers for {game}: {e}")
@@ -315,6 +1451,37 @@ class StreamerManager:
             print(f"Error fetching drop campaigns: {e}")
             return [], {}
 
+    def resolve_game_slugs(self, game_names):
+        """
+        Map game names to directory slugs, consulting the persistent slug cache first.
+        Misses are resolved together in one batched DirectoryGameRedirect request; games Twitch
+        doesn't know are cached as None for a short time. Names that failed to resolve map to None.
+        """
+        slugs = {}
+        misses = []
+        for game_name in game_names:
+            found, slug = self.slug_cache.lookup(game_name)
+            if found:
+                slugs[game_name] = slug
+            else:
+                misses.append(game_name)
+        
+        if misses:
+            slug_queries = [self.gql.operation("DirectoryGameRedirect", {"name": game_name}) for game_name in misses]
+            resolved = {}
+            for game_name, data in zip(misses, self.gql.post_batch(slug_queries)):
+                slugs[game_name] = None
+                if 'errors' in data:
+                    # Transport or server errors are not a real "no such game", so don't cache them
+                    print(f"Failed to resolve slug for {game_name}: {data['errors']}")
+                    continue
+                game_data = (data.get('data') or {}).get('game')
+                slugs[game_name] = game_data.get('slug') if game_data else None
+                resolved[game_name] = slugs[game_name]
+            self.slug_cache.update(resolved)
+        
+        return slugs
+
     def get_drops_enabled_streamers(self, game_name):
         """
         Get streamers that have drops enabled for a specific game.
@@ -323,67 +1490,19 @@ class StreamerManager:
         try:
             print(f"Fetching drops-enabled streamers for {game_name}...")
             
-            url = "https://gql.twitch.tv/gql"
-            headers = {
-                'Client-Id': 'kimne78kx3ncx6brgo4mv6wki5h1ko',
-                'Content-Type': 'application/json',
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
             # First get the game slug
-            slug_query = {
-                "operationName": "DirectoryGameRedirect",
-                "variables": {"name": game_name},
-                "extensions": {
-                    "persistedQuery": {
-                        "version": 1,
-                        "sha256Hash": "1f0300090caceec51f33c5e20647aceff9017f740f223c3c532ba6fa59f6b6cc"
-                    }
-                }
-            }
-            
-            response = requests.post(url, json=slug_query, headers=headers)
-            if response.status_code != 200:
+            slug = self.resolve_game_slugs([game_name]).get(game_name)
+            if not slug:
                 return []
             
-            data = response.json()
-            game_data = data.get('data', {}).get('game')
-            if not game_data or not game_data.get('slug'):
-                return []
-            
-            slug = game_data['slug']
-            
             # Get live streamers with drops enabled for this game
             # Using the same query structure as TwitchDropsMiner
-            directory_query = {
-                "operationName": "DirectoryPage_Game",
-                "variables": {
-                    "limit": 100,  # Get more streamers
-                    "slug": slug,
-                    "imageWidth": 50,
-                    "includeIsDJ": False,
-                    "options": {
-                        "broadcasterLanguages": [],
-                        "freeformTags": None,
-                        "includeRestricted": ["SUB_ONLY_LIVE"],
-                        "recommendationsContext": {"platform": "web"},
-                        "sort": "VIEWER_COUNT",  # Sort by viewers for best streamers
-                        "systemFilters": ["DROPS_ENABLED"],  # This is the key filter!
-                        "tags": [],
-                        "requestID": "JIRA-VXP-2397",
-                    },
-                    "includeIsDJ": False,
-                    "sortTypeIsRecency": False,
-                },
-                "extensions": {
-                    "persistedQuery": {
-                        "version": 1,
-                        "sha256Hash": "c7c9d5aad09155c4161d2382092dc44610367f3536aac39019ec2582ae5065f9"
-                    }
-                }
-            }
+            directory_query = self.gql.operation(
+                "DirectoryPage_Game",
+                directory_variables(slug, 100, system_filters=["DROPS_ENABLED"]),  # Get more streamers
+            )
             
-            response = requests.post(url, json=directory_query, headers=headers)
+            response = self.gql.post(directory_query)
             if response.status_code != 200:
                 print(f"      Failed to fetch drops-enabled streamers: HTTP {response.status_code}")
                 return []
@@ -408,132 +1527,147 @@ class StreamerManager:
     def get_drops_enabled_streamers_by_slug(self, game_slug, game_name, target_count=5):
         """
         Get streamers that have drops enabled for a specific game using the game slug directly.
-        Filters for ASCII-only streamers and fetches multiple pages to get accurate total count.
-        Returns tuple: (top_streamers_list, total_ascii_count)
+        Filters for ASCII-only streamers and stops paging once target_count of them are found, so the
+        usual top-5 lookup costs a single request.
+        Returns tuple: (top_streamers_list, ascii_count_seen, has_more, viewers_seen, stream_stats) where has_more
+        means the directory continues past the pages read, so the counts are lower bounds, and stream_stats
+        maps each top streamer to stream_stats_from_node().
         """
         try:
             print(f"    Fetching drops-enabled streamers for {game_name} (slug: {game_slug})...")
             
-            url = "https://gql.twitch.tv/gql"
-            headers = {
-                'Client-Id': 'kimne78kx3ncx6brgo4mv6wki5h1ko',
-                'Content-Type': 'application/json',
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            ascii_streamers = []
+            top_streamers = []
+            stream_stats = {}
+            ascii_count = 0
+            viewers = 0
             skipped_streamers = []
-            offset = 0
-            limit = 20
-            
-            # Fetch multiple pages to get a more accurate total count
-            # We'll fetch up to 100 streamers (5 pages) to get a better picture
-            max_pages = 5
-            pages_fetched = 0
-            
-            while pages_fetched < max_pages and offset < 100:  # Safety limit
-                # Get live streamers with drops enabled for this game using the slug directly
-                directory_query = {
-                    "operationName": "DirectoryPage_Game",
-                    "variables": {
-                        "limit": limit,
-                        "cursor": str(offset) if offset > 0 else None,
-                        "slug": game_slug,
-                        "imageWidth": 50,
-                        "includeIsDJ": False,
-                        "options": {
-                            "broadcasterLanguages": [],
-                            "freeformTags": None,
-                            "includeRestricted": ["SUB_ONLY_LIVE"],
-                            "recommendationsContext": {"platform": "web"},
-                            "sort": "VIEWER_COUNT",  # Sort by viewers for best streamers
-                            "systemFilters": ["DROPS_ENABLED"],  # This is the key filter!
-                            "tags": [],
-                            "requestID": "JIRA-VXP-2397",
-                        },
-                        "includeIsDJ": False,
-                        "sortTypeIsRecency": False,
-                    },
-                    "extensions": {
-                        "persistedQuery": {
-                            "version": 1,
-                            "sha256Hash": "c7c9d5aad09155c4161d2382092dc44610367f3536aac39019ec2582ae5065f9"
-                        }
-                    }
-                }
-                
-                response = requests.post(url, json=directory_query, headers=headers)
-                if response.status_code != 200:
-                    print(f"      Failed to fetch drops-enabled streamers: HTTP {response.status_code}")
-                    break
-                
-                try:
-                    data = response.json()
-                except:
-                    print(f"      Failed to parse JSON response")
-                    break
-                
-                # Check for GraphQL errors
-                if 'errors' in data:
-                    print(f"      GraphQL errors: {data['errors']}")
-                    break
-                
-                # Navigate through the response structure carefully
-                if 'data' not in data:
-                    print(f"      No 'data' field in response")
-                    break
-                    
-                if 'game' not in data['data'] or not data['data']['game']:
-                    print(f"      No game data in response")
-                    break
-                    
-                game_data = data['data']['game']
-                if 'streams' not in game_data or not game_data['streams']:
-                    print(f"      No streams data in game response")
-                    break
-                    
-                streams_data = game_data['streams']
-                if 'edges' not in streams_data:
-                    print(f"      No edges in streams data")
-                    break
-                    
-                streams = streams_data['edges']
-                if not streams:
-                    print(f"      No stream edges found at offset {offset}")
-                    break
-                
-                # Process streamers and filter for ASCII
-                for stream in streams:
-                    node = stream.get('node', {})
+            streams = DirectoryStreams(self.gql, game_slug)
+            
+            for page in streams.pages():
+                # Process the whole page we already paid for, then decide whether to fetch another
+                for node in page:
                     broadcaster = node.get('broadcaster')
                     if broadcaster and broadcaster.get('displayName'):
                         streamer_name = broadcaster['displayName']
                         if streamer_name.isascii():
-                            ascii_streamers.append(streamer_name)
+                            ascii_count += 1
+                            viewers += node.get('viewersCount') or 0
+                            if len(top_streamers) < target_count:
+                                top_streamers.append(streamer_name)
+                                stream_stats[streamer_name] = stream_stats_from_node(node)
                         else:
                             skipped_streamers.append(streamer_name)
-                
-                offset += limit
-                pages_fetched += 1
+                if len(top_streamers) >= target_count:
+                    break
             
             if skipped_streamers:
                 print(f"      ⚠️  Skipped {len(skipped_streamers)} non-ASCII streamers: {', '.join(skipped_streamers[:3])}{'...' if len(skipped_streamers) > 3 else ''}")
             
-            total_ascii_count = len(ascii_streamers)
-            top_streamers = ascii_streamers[:target_count]
+            if streams.error and not top_streamers:
+                raise GQLRequestError(streams.error)
             
-            print(f"      ✅ Found {total_ascii_count} ASCII streamers for {game_name} (showing top {len(top_streamers)})")
-            return top_streamers, total_ascii_count
+            more_label = "+" if streams.has_more else ""
+            print(f"      ✅ Found {ascii_count}{more_label} ASCII streamers for {game_name} (showing top {len(top_streamers)}, {streams.pages_fetched} page{'s' if streams.pages_fetched != 1 else ''})")
+            return top_streamers, ascii_count, streams.has_more, viewers, stream_stats
             
+        except GQLRequestError:
+            raise  # Let the caller tell "lookup failed" apart from "no streamers"
         except Exception as e:
             print(f"Error fetching drops-enabled streamers for {game_name}: {e}")
-            return [], 0
+            return [], 0, False, 0, {}
 
-    def load_twitch_auth_cookies(self):
+    def count_drops_enabled_streamers(self, game_slug, game_name, target_count=5, time_budget=DIRECTORY_COUNT_BUDGET):
         """
-        Load authentication cookies from Twitch-Channel-Points-Miner's cookie file.
-        This allows us to authenticate with Twitch and access real drop campaigns.
+        Count-only walk of a game's drops-enabled directory for real reach numbers.
+        Walks every page (or uses a server-side total if the response has one) while keeping only
+        running counters and the top target_count ASCII streamers, so memory stays flat for big games.
+        Stops when time_budget seconds are used up, in which case the counts are lower bounds.
+        Returns the same tuple as get_drops_enabled_streamers_by_slug.
         """
+        try:
+            print(f"    Counting drops-enabled streamers for {game_name} (slug: {game_slug})...")
+            
+            top_streamers = []
+            stream_stats = {}
+            ascii_count = 0
+            skipped_count = 0
+            viewers = 0
+            deadline = time.monotonic() + time_budget
+            streams = DirectoryStreams(self.gql, game_slug, page_size=DIRECTORY_COUNT_PAGE_SIZE)
+            
+            for page in streams.pages():
+                for node in page:
+                    broadcaster = node.get('broadcaster')
+                    if not broadcaster or not broadcaster.get('displayName'):
+                        continue
+                    streamer_name = broadcaster['displayName']
+                    if streamer_name.isascii():
+                        ascii_count += 1
+                        viewers += node.get('viewersCount') or 0
+                        if len(top_streamers) < target_count:
+                            top_streamers.append(streamer_name)
+                            stream_stats[streamer_name] = stream_stats_from_node(node)
+                    else:
+                        skipped_count += 1
+                if streams.total_count is not None and len(top_streamers) >= target_count:
+                    # The server already told us the total, no need to walk the rest
+                    # (the viewer sum would only cover the pages read, so it is reported as unknown)
+                    ascii_count = max(ascii_count, streams.total_count - skipped_count)
+                    viewers = 0
+                    streams.has_more = False
+                    break
+                if time.monotonic() >= deadline:
+                    print(f"      ⏱️  Count budget of {time_budget}s used up after {streams.pages_fetched} pages")
+                    break
+            
+            if streams.error and not top_streamers:
+                raise GQLRequestError(streams.error)
+            
+            more_label = "+" if streams.has_more else ""
+            print(f"      ✅ Counted {ascii_count}{more_label} ASCII streamers, {viewers}{more_label} viewers for {game_name} ({skipped_count} non-ASCII skipped, {streams.pages_fetched} pages)")
+            return top_streamers, ascii_count, streams.has_more, viewers, stream_stats
+            
+        except GQLRequestError:
+            raise  # Let the caller tell "lookup failed" apart from "no streamers"
+        except Exception as e:
+            print(f"Error counting drops-enabled streamers for {game_name}: {e}")
+            return [], 0, False, 0, {}
+
+    @staticmethod
+    def _file_signature(path):
+        try:
+            stat = os.stat(path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def _cookie_entry_valid(self, entry):
+        """A cached cookie entry stays valid while its source .pkl has the same mtime and size."""
+        if not isinstance(entry, dict) or not isinstance(entry.get('cookies'), dict):
+            return False
+        return self._file_signature(entry.get('source', '')) == (entry.get('mtime_ns'), entry.get('size'))
+
+    def _cookie_file_candidates(self):
+        """
+        Yield cookie .pkl paths to try, in order.
+        A pinned path (COOKIE_FILE_ENV / COOKIE_FILE) replaces the search entirely; otherwise the last
+        file that worked is tried first and the common miner locations are only listed if it is gone.
+        """
+        pinned = os.environ.get(COOKIE_FILE_ENV) or COOKIE_FILE
+        if pinned:
+            if os.path.isdir(pinned):
+                for filename in sorted(f for f in os.listdir(pinned) if f.endswith('.pkl')):
+                    yield os.path.join(pinned, filename)
+            elif os.path.isfile(pinned):
+                yield pinned
+            else:
+                print(f"❌ Pinned cookie path not found: {pinned}")
+            return
+        
+        cached = self._auth_cookies or self._read_cookie_cache()
+        if cached and os.path.isfile(cached.get('source', '')):
+            yield cached['source']
+        
         # Get the directory where gibdrop.py is located
         script_dir = os.path.dirname(os.path.abspath(__file__))
         
@@ -554,8 +1688,6 @@ class StreamerManager:
         ])
         
         print("🔍 Looking for authentication cookies...")
-        cookies = {}
-        
         for cookie_dir in possible_paths:
             print(f"   Checking: {cookie_dir}")
             try:
@@ -565,26 +1697,8 @@ class StreamerManager:
                     pkl_files = [f for f in os.listdir(cookie_dir) if f.endswith('.pkl')]
                     if pkl_files:
                         print(f"   📁 Found {len(pkl_files)} .pkl files: {pkl_files}")
-                        
                         for filename in pkl_files:
-                            cookie_path = os.path.join(cookie_dir, filename)
-                            try:
-                                with open(cookie_path, 'rb') as f:
-                                    cookie_data = pickle.load(f)
-                                
-                                # Parse cookie data (list of cookie dicts)
-                                if isinstance(cookie_data, list):
-                                    for cookie in cookie_data:
-                                        if isinstance(cookie, dict) and 'name' in cookie and 'value' in cookie:
-                                            cookies[cookie['name']] = cookie['value']
-                                
-                                print(f"✅ Loaded authentication cookies from {cookie_path}")
-                                print(f"   Found cookies: {list(cookies.keys())}")
-                                return cookies
-                                
-                            except Exception as e:
-                                print(f"⚠ Failed to load {cookie_path}: {e}")
-                                continue
+                            yield os.path.join(cookie_dir, filename)
                     else:
                         print(f"   ⚠ Directory exists but no .pkl files found")
                 else:
@@ -592,6 +1706,64 @@ class StreamerManager:
             except Exception as e:
                 print(f"   ❌ Error checking {cookie_dir}: {e}")
                 continue
+
+    def _read_cookie_cache(self):
+        try:
+            with open(COOKIE_CACHE_FILE, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            return entry if isinstance(entry, dict) else None
+        except (OSError, ValueError):
+            return None
+
+    def load_twitch_auth_cookies(self):
+        """
+        Load authentication cookies from Twitch-Channel-Points-Miner's cookie file.
+        This allows us to authenticate with Twitch and access real drop campaigns.
+        The parsed cookies are kept in memory and in COOKIE_CACHE_FILE (JSON, owner-only), so repeat
+        calls only stat the source .pkl; it is searched for and unpickled again only when it changes.
+        """
+        pinned = os.environ.get(COOKIE_FILE_ENV) or COOKIE_FILE
+        pinned = os.path.abspath(pinned) if pinned else None
+        for entry in (self._auth_cookies, self._read_cookie_cache()):
+            # A cache entry from a different file than the pinned one does not count
+            if self._cookie_entry_valid(entry) and pinned in (None, entry['source'], os.path.dirname(entry['source'])):
+                if entry is not self._auth_cookies:
+                    print(f"✅ Loaded authentication cookies from {entry['source']} (cached)")
+                self._auth_cookies = entry
+                return dict(entry['cookies'])
+        
+        cookies = {}
+        for cookie_path in self._cookie_file_candidates():
+            try:
+                import pickle
+                signature = self._file_signature(cookie_path)
+                with open(cookie_path, 'rb') as f:
+                    cookie_data = pickle.load(f)
+                
+                # Parse cookie data (list of cookie dicts)
+                if isinstance(cookie_data, list):
+                    for cookie in cookie_data:
+                        if isinstance(cookie, dict) and 'name' in cookie and 'value' in cookie:
+                            cookies[cookie['name']] = cookie['value']
+                
+                print(f"✅ Loaded authentication cookies from {cookie_path}")
+                print(f"   Found cookies: {list(cookies.keys())}")
+                if signature:
+                    self._auth_cookies = {
+                        'source': os.path.abspath(cookie_path),
+                        'mtime_ns': signature[0],
+                        'size': signature[1],
+                        'cookies': cookies,
+                    }
+                    try:
+                        write_json_atomic(COOKIE_CACHE_FILE, self._auth_cookies, mode=0o600)
+                    except OSError as e:
+                        print(f"⚠️  Could not write cookie cache: {e}")
+                return dict(cookies)
+                
+            except Exception as e:
+                print(f"⚠ Failed to load {cookie_path}: {e}")
+                continue
         
         print("❌ No authentication cookies found in any location")
         return cookies
@@ -636,42 +1808,41 @@ class StreamerManager:
         Fetch real drop campaigns using the Inventory GraphQL API with authentication.
         """
         try:
-            url = "https://gql.twitch.tv/gql"
-            headers = {
-                'Client-Id': 'kimne78kx3ncx6brgo4mv6wki5h1ko',
-                'Content-Type': 'application/json',
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            # Add authentication
-            cookie_string = "; ".join([f"{name}={value}" for name, value in auth_cookies.items()])
-            headers['Cookie'] = cookie_string
-            
-            if 'auth-token' in auth_cookies:
-                headers['Authorization'] = f"OAuth {auth_cookies['auth-token']}"
+            # Add authentication (Cookie/Authorization headers are built once on the shared client)
+            self.gql.set_auth_cookies(auth_cookies)
             
             print("🔍 Trying multiple campaign discovery methods...")
             
-            # Method 1: Inventory query (shows enrolled campaigns)
-            print("  📋 Method 1: Checking user inventory for enrolled campaigns...")
-            inventory_query = {
-                "operationName": "Inventory",
-                "variables": {
-                    "fetchRewardCampaigns": False,
-                },
-                "extensions": {
-                    "persistedQuery": {
-                        "version": 1,
-                        "sha256Hash": "d86775d0ef16a63a33ad52e80eaff963b2d5b72fada7c991504a57496e1d8e4b"
-                    }
-                }
+            # Both methods are independent, so they run in parallel and a slow one can't hold up the other
+            inventory_query = self.gql.operation("Inventory", {"fetchRewardCampaigns": False})
+            campaigns_query = self.gql.operation("ViewerDropsDashboard")
+            caller = network_caller()  # The posts run on their own threads, so this method isn't on their stacks
+            finished, timed_out = run_with_deadlines({
+                "inventory": lambda: self.gql.post_batch([inventory_query], auth=True, caller=caller)[0],
+                "dashboard": lambda: self.gql.post_batch([campaigns_query], auth=True, caller=caller)[0],
+            }, DISCOVERY_DEADLINES)
+            self.timed_out_sources.extend(timed_out)
+            source_data = {
+                name: finished[name].result() if name in finished else gql_error(f"timed out after {DISCOVERY_DEADLINES[name]}s")
+                for name in ("inventory", "dashboard")
             }
+            # An error result (5xx after retries, open circuit, no user data) is not "no campaigns"
+            self.failed_sources.extend(
+                name for name, data in source_data.items()
+                if name not in timed_out and not ((data.get('data') or {}).get('currentUser'))
+            )
+            inventory_data, dashboard_data = source_data["inventory"], source_data["dashboard"]
             
-            response = requests.post(url, json=inventory_query, headers=headers, timeout=15)
+            # Method 1: Inventory query (shows enrolled campaigns)
+            print("  📋 Method 1: Checking user inventory for enrolled campaigns...")
             
             inventory_campaigns = []
-            if response.status_code == 200:
-                data = response.json()
+            # Campaigns without eligible streamers, enriched concurrently once both methods have run
+            campaigns_to_enrich = []
+            # Not listed as campaigns until they start, but the daemon polls quickly around their launch
+            upcoming_starts = []
+            if 'data' in inventory_data:
+                data = inventory_data
                 
                 if 'data' in data and data['data'] and 'currentUser' in data['data']:
                     user_data = data['data']['currentUser']
@@ -680,8 +1851,6 @@ class StreamerManager:
                     
                     print(f"    ✅ Found {len(campaigns_in_progress)} campaigns in user inventory")
                     
-                    print(f"    ✅ Found {len(campaigns_in_progress)} campaigns in user inventory")
-                    
                     for campaign_data in campaigns_in_progress:
                         try:
                             status = campaign_data.get('status', 'UNKNOWN')
@@ -690,6 +1859,8 @@ class StreamerManager:
                             game_name = game_data.get('name', 'Unknown Game') if game_data else 'Unknown Game'
                             
                             print(f"    📋 Inventory: {campaign_name} ({game_name}) - Status: {status}")
+                            if status == 'UPCOMING' and campaign_data.get('startAt'):
+                                upcoming_starts.append(campaign_data['startAt'])
                             
                             # Only include active campaigns
                             if status == 'ACTIVE':
@@ -725,33 +1896,30 @@ class StreamerManager:
                                         unique_streamers.append(streamer)
                                         seen.add(streamer)
                                 
-                                # If no streamers found in campaign data, try to fetch them separately
-                                if not unique_streamers and game_name and game_name != 'Unknown Game':
-                                    print(f"    No eligible streamers in campaign data, fetching drops-enabled streamers for {game_name}...")
-                                    drops_enabled_streamers, total_fetched = self.get_drops_enabled_streamers_by_slug(game_slug, game_name, 5)
-                                    unique_streamers = drops_enabled_streamers  # Already limited to 5 ASCII streamers
-                                else:
-                                    total_fetched = len(unique_streamers)  # Use actual streamers found in campaign data
-                                
-                                campaign_info = {
-                                    'name': campaign_name,
-                                    'game': game_name,
-                                    'slug': game_slug,
-                                    'streamers': unique_streamers,
-                                    'streamer_count': len(unique_streamers),
-                                    'fetched_streamer_count': total_fetched,
-                                    'total_viewers': 0,
-                                    'status': status,
-                                    'campaign_id': campaign_data.get('id', ''),
-                                    'start_time': campaign_data.get('startAt', ''),
-                                    'end_time': campaign_data.get('endAt', ''),
-                                    'details_url': campaign_data.get('detailsURL', ''),
-                                    'image_url': campaign_data.get('imageURL', ''),
-                                    'drops_count': len(drops),
-                                    'type': 'INVENTORY_CAMPAIGN'
-                                }
+                                minutes_remaining, drops_remaining, drops_unreachable = campaign_drop_progress(drops, campaign_data.get('endAt'))
+                                campaign_info = Campaign(
+                                    campaign_id=campaign_data.get('id') or f"name:{campaign_name}",
+                                    name=campaign_name,
+                                    game=game_name,
+                                    type='INVENTORY_CAMPAIGN',
+                                    slug=game_slug,
+                                    status=status,
+                                    streamers=unique_streamers,  # Counts come from the actual streamers in campaign data
+                                    start_time=campaign_data.get('startAt', ''),
+                                    end_time=campaign_data.get('endAt', ''),
+                                    details_url=campaign_data.get('detailsURL', ''),
+                                    image_url=campaign_data.get('imageURL', ''),
+                                    drops_count=len(drops),
+                                    minutes_remaining=minutes_remaining,
+                                    drops_remaining=drops_remaining,
+                                    drops_unreachable=drops_unreachable,
+                                )
                                 inventory_campaigns.append(campaign_info)
-                                print(f"    🏆 {campaign_name} ({game_name}) - {len(drops)} drops, {len(unique_streamers)} streamers")
+                                
+                                # If no streamers found in campaign data, fetch them separately
+                                if not unique_streamers and game_name and game_name != 'Unknown Game':
+                                    print(f"    No eligible streamers in campaign data, queued drops-enabled lookup for {game_name}")
+                                    campaigns_to_enrich.append(campaign_info)
                                 
                         except Exception as e:
                             print(f"    Error parsing inventory campaign: {e}")
@@ -759,80 +1927,79 @@ class StreamerManager:
                 else:
                     print("    ❌ No user data in inventory response")
             else:
-                print(f"    ❌ Inventory API failed: HTTP {response.status_code}")
+                print(f"    ❌ Inventory API failed: {inventory_data.get('errors')}")
             
             # Method 2: Try ViewerDropsDashboard API (different endpoint, might show more campaigns)
             print("  🌐 Method 2: Checking ViewerDropsDashboard API...")
+            known_ids = {campaign_info.campaign_id for campaign_info in inventory_campaigns}
             try:
-                campaigns_query = {
-                    "operationName": "ViewerDropsDashboard",
-                    "variables": {},
-                    "extensions": {
-                        "persistedQuery": {
-                            "version": 1,
-                            "sha256Hash": "5a33c1d45d3012503f8c9a7eccdde3de5b4b5d9ec262cce16d2e93bd5afecbb0"
-                        }
-                    }
-                }
-                
-                response = requests.post(url, json=campaigns_query, headers=headers, timeout=15)
                 public_campaigns = []
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    campaigns_data = data.get('data', {}).get('currentUser', {}).get('dropCampaigns', [])
+                if 'data' in dashboard_data:
+                    data = dashboard_data
+                    campaigns_data = (data.get('data') or {}).get('currentUser', {}).get('dropCampaigns', [])
                     
                     print(f"    ✅ Found {len(campaigns_data)} campaigns in dashboard API")
                     
                     for campaign_data in campaigns_data:
                         try:
                             status = campaign_data.get('status', 'UNKNOWN')
+                            if status == 'UPCOMING' and campaign_data.get('startAt'):
+                                upcoming_starts.append(campaign_data['startAt'])
                             if status == 'ACTIVE':
                                 campaign_name = campaign_data.get('name', 'Unknown Campaign')
                                 game_data = campaign_data.get('game', {})
                                 game_name = game_data.get('name', 'Unknown Game') if game_data else 'Unknown Game'
                                 game_slug = game_data.get('slug', '') if game_data else ''
                                 
-                                # Check if this campaign is already in our inventory list
-                                already_found = any(c['name'] == campaign_name for c in inventory_campaigns)
-                                if not already_found:
+                                # Skip campaigns already in our inventory list (or listed twice)
+                                campaign_id = campaign_data.get('id') or f"name:{campaign_name}"
+                                if campaign_id not in known_ids:
+                                    known_ids.add(campaign_id)
+                                    campaign_info = Campaign(
+                                        campaign_id=campaign_id,
+                                        name=campaign_name,
+                                        game=game_name,
+                                        type='DASHBOARD_CAMPAIGN',
+                                        slug=game_slug,
+                                        status=status,
+                                        start_time=campaign_data.get('startAt', ''),
+                                        end_time=campaign_data.get('endAt', ''),
+                                        details_url=campaign_data.get('detailsURL', ''),
+                                        image_url=campaign_data.get('imageURL', ''),
+                                        drops_count=len(campaign_data.get('timeBasedDrops', [])),
+                                    )
+                                    public_campaigns.append(campaign_info)
+                                    
                                     # Get streamers for this campaign
-                                    streamers = []
-                                    total_fetched = 0
                                     if game_slug:
-                                        streamers, total_fetched = self.get_drops_enabled_streamers_by_slug(game_slug, game_name, 5)
-                                    
-                                    campaign_info = {
-                                        'name': campaign_name,
-                                        'game': game_name,
-                                        'slug': game_slug,
-                                        'streamers': streamers,
-                                        'streamer_count': len(streamers),
-                                        'fetched_streamer_count': total_fetched,
-                                        'total_viewers': 0,
-                                        'status': status,
-                                        'campaign_id': campaign_data.get('id', ''),
-                                        'start_time': campaign_data.get('startAt', ''),
-                                        'end_time': campaign_data.get('endAt', ''),
-                                        'details_url': campaign_data.get('detailsURL', ''),
-                                        'image_url': campaign_data.get('imageURL', ''),
-                                        'drops_count': len(campaign_data.get('timeBasedDrops', [])),
-                                        'type': 'DASHBOARD_CAMPAIGN'
-                                    }
-                                    public_campaigns.append(campaign_info)
-                                    print(f"    🌟 {campaign_name} ({game_name}) - dashboard campaign, {len(streamers)} streamers")
+                                        campaigns_to_enrich.append(campaign_info)
                                 
                         except Exception as e:
                             print(f"    Error parsing public campaign: {e}")
                             continue
                             
                 else:
-                    print(f"    ❌ ViewerDropsDashboard API failed: HTTP {response.status_code}")
+                    print(f"    ❌ ViewerDropsDashboard API failed: {dashboard_data.get('errors')}")
                     
             except Exception as e:
                 print(f"    ❌ ViewerDropsDashboard query error: {e}")
                 public_campaigns = []
             
+            if upcoming_starts or 'data' in dashboard_data:
+                self.upcoming_campaign_starts = sorted(filter(None, map(parse_twitch_time, set(upcoming_starts))))
+            
+            # Campaign game data already carries the slug, so remember it for the by-name paths
+            self.slug_cache.update({c.game: c.slug for c in inventory_campaigns + public_campaigns if c.slug and c.game != 'Unknown Game'})
+            
+            self._enrich_campaigns(campaigns_to_enrich)
+            
+            for campaign_info in inventory_campaigns:
+                progress = campaign_info.progress_summary()
+                print(f"    🏆 {campaign_info.name} ({campaign_info.game}) - {campaign_info.drops_count} drops, {campaign_info.streamer_count} streamers{f' | {progress}' if progress else ''}")
+            for campaign_info in public_campaigns:
+                print(f"    🌟 {campaign_info.name} ({campaign_info.game}) - dashboard campaign, {campaign_info.streamer_count} streamers")
+            
             # Combine campaigns from both authenticated APIs
             all_campaigns = inventory_campaigns + public_campaigns
             print(f"🎯 Total campaigns found: {len(all_campaigns)} ({len(inventory_campaigns)} inventory + {len(public_campaigns)} dashboard)")
@@ -843,7 +2010,303 @@ class StreamerManager:
             print(f"❌ Campaign discovery error: {e}")
             return []
 
+    def _enrich_campaigns(self, campaigns):
+        """
+        Fetch drops-enabled streamers for campaigns that listed no eligible streamers.
+        Lookups run on a bounded thread pool and results are written back in submission order,
+        so campaign order is unchanged and a failed lookup only leaves its own campaign empty.
+        """
+        if not campaigns:
+            return
+        
+        workers = max(1, min(self.discovery_workers, len(campaigns)))
+        print(f"  👥 Fetching drops-enabled streamers for {len(campaigns)} campaigns ({workers} workers)...")
+        lookup = self.count_drops_enabled_streamers if self.count_streamers else self.get_drops_enabled_streamers_by_slug
+        
+        # Workers inherit the caller's thread name so background refresh output stays muted
+        thread_prefix = f"{threading.current_thread().name}-enrich"
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=thread_prefix) as executor:
+            futures = [
+                (campaign_info, executor.submit(lookup, campaign_info.slug, campaign_info.game, 5))
+                for campaign_info in campaigns
+            ]
+            for campaign_info, future in futures:
+                try:
+                    streamers, total_fetched, has_more, viewers, stream_stats = future.result()  # Already limited to 5 ASCII streamers
+                    campaign_info.lookup_failed = False
+                except Exception as e:
+                    print(f"    ⚠️  Streamer lookup failed for {campaign_info.name}: {e}")
+                    streamers, total_fetched, has_more, viewers, stream_stats = [], 0, False, 0, {}
+                    campaign_info.lookup_failed = True
+                campaign_info.set_streamers(streamers, total_fetched, has_more, viewers, stream_stats)
+
+    def _cached_campaigns(self):
+        """The campaigns in the discovery cache, fresh or not; [] if there are none or they can't be read."""
+        cached, _, _ = self.discovery_cache.get("campaigns")
+        try:
+            return self._decode_campaigns(cached or [])
+        except (TypeError, AttributeError):
+            return []
+
+    @staticmethod
+    def _encode_campaigns(campaigns):
+        return [campaign.to_dict() for campaign in campaigns]
+
+    @staticmethod
+    def _decode_campaigns(value):
+        return [Campaign.from_dict(entry) for entry in value]
+
+    @staticmethod
+    def _encode_rust_drops(rust_drops):
+        streamers, streamer_drops, general_drops, campaign_start, campaign_end, is_active = rust_drops
+        return {
+            'streamers': streamers,
+            'streamer_drops': streamer_drops,
+            'general_drops': general_drops,
+            'campaign_start': campaign_start.isoformat() if campaign_start else None,
+            'campaign_end': campaign_end.isoformat() if campaign_end else None,
+            'is_active': is_active,
+        }
+
+    @staticmethod
+    def _decode_rust_drops(value):
+        campaign_start = datetime.fromisoformat(value['campaign_start']) if value.get('campaign_start') else None
+        campaign_end = datetime.fromisoformat(value['campaign_end']) if value.get('campaign_end') else None
+        # Re-check activity against the current time; the snapshot may predate the start or end
+        is_active = value.get('is_active', False)
+        if campaign_start and campaign_end:
+            is_active = campaign_start <= datetime.now(timezone.utc) <= campaign_end
+        return value.get('streamers', []), value.get('streamer_drops', 0), value.get('general_drops', 0), campaign_start, campaign_end, is_active
+
+    def load_cached_discovery(self):
+        """
+        Return {source: (value, fetched_at, is_fresh)} for every discovery source with a cached snapshot.
+        A cached Rust campaign whose active state has flipped since it was fetched counts as stale.
+        """
+        cached = {}
+        for source in DISCOVERY_SOURCES:
+            value, fetched_at, is_fresh = self.discovery_cache.get(source)
+            if value is None:
+                continue
+            try:
+                if source == "rust_drops":
+                    decoded = self._decode_rust_drops(value)
+                    if decoded[5] != value.get('is_active'):
+                        is_fresh = False
+                    value = decoded
+                elif source == "campaigns":
+                    value = self._decode_campaigns(value)
+            except Exception:
+                continue
+            cached[source] = (value, fetched_at, is_fresh)
+        return cached
+
+    def refresh_discovery(self, sources=DISCOVERY_SOURCES):
+        """
+        Fetch the given discovery sources live, in parallel, and store successful results in the cache.
+        Returns {source: value}; a source that failed maps to None. Sources that missed their
+        DISCOVERY_DEADLINES entry are listed in self.timed_out_sources, those that failed in self.failed_sources.
+        """
+        self.timed_out_sources = []
+        self.failed_sources = []
+        tasks = {}
+        if "rust_drops" in sources:
+            print("🦀 Fetching Rust drop streamers...")
+            tasks["facepunch"] = self.get_rust_drops
+        if "campaigns" in sources:
+            print("🔍 Fetching current campaigns...")
+            # Inventory and Dashboard have their own deadlines; streamer lookups must finish
+            tasks["campaigns"] = self.get_current_campaigns
+        finished, timed_out = run_with_deadlines(tasks, DISCOVERY_DEADLINES)
+        self.timed_out_sources.extend(timed_out)
+        
+        results = {}
+        if "campaigns" in sources:
+            campaigns = finished["campaigns"].result()
+            degraded = self._restore_failed_lookups(campaigns)
+            missing = self._restore_missing_campaigns(campaigns)
+            # An empty list is also what errors and missing cookies produce, so it isn't cached
+            if degraded:
+                print(f"⚠️  Streamer lookups failed for {degraded} campaign(s); keeping the previous discovery cache")
+            elif missing:
+                print(f"⚠️  {', '.join(missing)} timed out or failed; showing its last known campaigns and keeping the previous discovery cache")
+            elif campaigns:
+                self.discovery_cache.put("campaigns", self._encode_campaigns(campaigns))
+            results["campaigns"] = campaigns
+        if "rust_drops" in sources:
+            try:
+                if "facepunch" not in finished:
+                    raise TimeoutError(f"timed out after {DISCOVERY_DEADLINES['facepunch']}s")
+                rust_drops = finished["facepunch"].result()
+                self.discovery_cache.put("rust_drops", self._encode_rust_drops(rust_drops))
+                results["rust_drops"] = rust_drops
+            except Exception as e:
+                print(f"⚠️ Error fetching Rust streamers: {e}")
+                if "facepunch" not in timed_out:
+                    self.failed_sources.append("facepunch")
+                results["rust_drops"] = None
+        if TELEMETRY.show_summary:
+            TELEMETRY.print_summary()
+        return results
+
+    def _restore_failed_lookups(self, campaigns):
+        """
+        Give campaigns whose streamer lookup failed their streamers from the cached snapshot, so a
+        Twitch outage doesn't show them as empty. Returns how many campaigns failed; the caller
+        must not cache a result that still contains them.
+        """
+        failed = [c for c in campaigns if c.lookup_failed]
+        if not failed:
+            return 0
+        previous = {c.campaign_id: c for c in self._cached_campaigns()}
+        for campaign in failed:
+            old = previous.get(campaign.campaign_id)
+            if old and old.streamers:
+                campaign.copy_streamers_from(old)
+        return len(failed)
+
+    def _restore_missing_campaigns(self, campaigns):
+        """
+        Add the cached campaigns of any Twitch source that timed out or failed, so a slow or failing
+        Inventory or Dashboard doesn't make its campaigns disappear. Returns the labels of those sources.
+        """
+        types = {"inventory": "INVENTORY_CAMPAIGN", "dashboard": "DASHBOARD_CAMPAIGN"}
+        missing = [name for name in types if name in self.timed_out_sources or name in self.failed_sources]
+        if not missing:
+            return []
+        present = {c.campaign_id for c in campaigns}
+        missing_types = {types[name] for name in missing}
+        campaigns.extend(c for c in self._cached_campaigns() if c.type in missing_types and c.campaign_id not in present)
+        return [DISCOVERY_SOURCE_LABELS[name] for name in missing]
+
+    def start_background_refresh(self, sources):
+        """Refresh stale sources on a background thread; pick the results up with take_refresh_results()."""
+        if self.refresh_in_progress():
+            return
+        if not isinstance(sys.stdout, QuietRefreshStdout):
+            sys.stdout = QuietRefreshStdout(sys.stdout)
+        self._refresh_results = None
+
+        def run():
+            self._refresh_results = self.refresh_discovery(sources)
+
+        self._refresh_thread = threading.Thread(target=run, name=REFRESH_THREAD_NAME, daemon=True)
+        self._refresh_thread.start()
+
+    def refresh_in_progress(self):
+        return self._refresh_thread is not None and self._refresh_thread.is_alive()
+
+    def wait_for_background_refresh(self):
+        if self._refresh_thread is not None:
+            self._refresh_thread.join()
+
+    def take_refresh_results(self):
+        """Return the finished background refresh results once, or None while it is still running."""
+        if self.refresh_in_progress():
+            return None
+        results, self._refresh_results = self._refresh_results, None
+        return results
+
+    def build_campaign_list(self, campaigns, rust_drops):
+        """
+        Combine Twitch campaigns with the Rust drops result, putting Rust first and dropping Twitch's Rust duplicates.
+        Campaigns are de-duplicated by campaign_id, so each one appears once however many sources listed it,
+        and Twitch campaigns are ordered by Campaign.priority: nearly complete first, unearnable last.
+        """
+        campaigns = sorted(unique_campaigns(campaigns or []), key=lambda campaign: campaign.priority)
+        if rust_drops is None:
+            return campaigns
+        
+        rust_streamers, streamer_drops, general_drops, campaign_start, campaign_end, is_active = rust_drops
+        
+        if rust_streamers and is_active:
+            # Format campaign dates for display
+            start_time = campaign_start.strftime('%Y-%m-%d %H:%M UTC') if campaign_start else ''
+            end_time = campaign_end.strftime('%Y-%m-%d %H:%M UTC') if campaign_end else ''
+            
+            # Create a virtual Rust campaign as the first option
+            rust_campaign = Campaign(
+                campaign_id='rust_drops',
+                name='Rust Drop Streamers',
+                game='Rust',
+                type='RUST_DROPS',
+                slug='rust',
+                streamers=rust_streamers,
+                start_time=start_time,
+                end_time=end_time,
+                details_url='https://twitch.facepunch.com/#drops',
+                drops_count=streamer_drops + general_drops,
+                streamer_drops=streamer_drops,
+                general_drops=general_drops,
+            )
+            
+            # Rust goes first; Twitch's own Rust campaigns are covered by it
+            campaigns = [rust_campaign] + [c for c in campaigns if c.game.lower() != 'rust']
+            print(f"✅ Added Rust drops as campaign #1 ({len(rust_streamers)} streamers)")
+            print(f"   🔍 Filtered out duplicate Rust campaigns from Twitch inventory")
+        elif campaign_start and not is_active:
+            print("⚠️ Rust campaign found but not currently active")
+        else:
+            print("⚠️ No Rust drop streamers found")
+        return campaigns
+
+    def get_discovery_results(self, force_refresh=False):
+        """
+        Return {source: value} for every discovery source without any prompts.
+        Fresh cached snapshots are reused; missing or stale sources (all of them with force_refresh) are
+        fetched now. A live fetch that fails or comes back empty falls back to the cached snapshot, even
+        when forced, so one bad fetch can't make a source's streamers drop out of the selection.
+        """
+        cached = self.load_cached_discovery()
+        results = {} if force_refresh else {source: value for source, (value, fetched_at, is_fresh) in cached.items() if is_fresh}
+        outdated_sources = [source for source in DISCOVERY_SOURCES if source not in results]
+        if outdated_sources:
+            fetched = self.refresh_discovery(outdated_sources)
+            for source, value in fetched.items():
+                # Fall back to a stale snapshot rather than nothing when a live fetch fails
+                if not value and source in cached:
+                    print(f"⚠️  Live {source} fetch failed or came back empty, using the cached snapshot")
+                    value = cached[source][0]
+                results[source] = value
+        else:
+            print("♻️  Using cached discovery results")
+        return results
+
+    def save_campaign_selection(self, selected_campaigns, combined_filename="selected_campaigns.txt"):
+        """
+        Write the combined streamer list for the selected campaigns plus one reference file per campaign.
+        The combined list is ordered by rank_streamers(). Files whose content is unchanged are left alone.
+        Returns the combined, de-duplicated streamer list.
+        """
+        unique_streamers = rank_streamers(selected_campaigns)
+        if unique_streamers:
+            print(f"   🏅 Top watch slots: {', '.join(unique_streamers[:3])}")
+        
+        self.save_default_streamers(unique_streamers, combined_filename)
+        
+        # Also save individual campaign files for reference
+        for campaign in selected_campaigns:
+            if campaign.is_rust:
+                individual_filename = "rust_drop_streamers.txt"
+            else:
+                safe_name = "".join(c for c in campaign.name if c.isalnum() or c in (' ', '-', '_')).strip()
+                individual_filename = f"campaign_{safe_name.replace(' ', '_').lower()}.txt"
+            
+            if campaign.streamers:
+                self.save_default_streamers(campaign.streamers, individual_filename)
+        
+        return unique_streamers
+
+    def set_active_streamers(self, filename):
+        """
+        Point active_streamers.txt at filename. Returns True if the pointer changed; whether the miner's
+        streamers changed is load_active_streamers() before the list was saved vs. after this.
+        """
+        return write_text_if_changed("active_streamers.txt", filename, in_place=mounted_in_container("active_streamers.txt"))
+
     def save_default_streamers(self, streamer_list, filename="default_streamers.txt"):
+        """Write one streamer per line to filename. Returns True if the file changed."""
         # Clean and save streamers (filtering already done during fetching)
         cleaned_streamers = []
         for name in streamer_list:
@@ -851,17 +2314,18 @@ class StreamerManager:
             if cleaned_name:
                 cleaned_streamers.append(cleaned_name)
         
-        print(f"   📝 Writing {len(cleaned_streamers)} streamers to {filename}")
-        
         # Check if filename exists as a directory and remove it
         if os.path.exists(filename) and os.path.isdir(filename):
             print(f"   ⚠️  {filename} exists as directory, removing it...")
             import shutil
             shutil.rmtree(filename)
         
-        with open(filename, "w", encoding="utf-8") as f:
-            for name in cleaned_streamers:
-                f.write(f"{name}\n")
+        content = "".join(f"{name}\n" for name in cleaned_streamers)
+        if not write_text_if_changed(filename, content, in_place=mounted_in_container(filename)):
+            print(f"   ✔️  {filename} unchanged ({len(cleaned_streamers)} streamers)")
+            return False
+        print(f"   📝 Wrote {len(cleaned_streamers)} streamers to {filename}")
+        return True
 
     def load_default_streamers_from_file(self, filename="default_streamers.txt"):
         try:
@@ -894,6 +2358,135 @@ class StreamerManager:
         except FileNotFoundError:
             return []
 
+RUNPY_RELOAD_INTERVAL = 10  # seconds between checks of the active streamer list inside run.py
+RUNPY_HOT_RELOAD_MARKER = "def start_streamer_watcher("
+# Injected into run.py after the streamer loading logic. It watches active_streamers.txt and the
+# list it points to, and adds/removes streamers in the running miner so a new selection applies
+# without restarting the container. If a live update fails it re-executes run.py in place.
+RUNPY_HOT_RELOAD_SOURCE = """
+# [gibdrop] patched: hot-reload of the active streamer list
+import sys
+import threading
+import time
+
+STREAMER_RELOAD_INTERVAL = %d
+
+def _gibdrop_file_signature(path):
+    try:
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return None
+
+def _gibdrop_list_signature():
+    try:
+        with open('active_streamers.txt', 'r', encoding='utf-8') as f:
+            filename = f.read().strip()
+    except OSError:
+        filename = ''
+    return (_gibdrop_file_signature('active_streamers.txt'), filename, _gibdrop_file_signature(filename) if filename else None)
+
+# The streamer couldn't be looked up (e.g. not a login); nothing was changed in the miner
+class _GibdropStreamerUnavailable(Exception):
+    pass
+
+def _gibdrop_add_streamer(miner, username):
+    from TwitchChannelPointsMiner.classes.Settings import Settings
+    from TwitchChannelPointsMiner.classes.entities.PubsubTopic import PubsubTopic
+    from TwitchChannelPointsMiner.utils import set_default_settings
+    try:
+        streamer = Streamer(username)
+        streamer.channel_id = miner.twitch.get_channel_id(streamer.username)
+        streamer.settings = set_default_settings(streamer.settings, Settings.streamer_settings)
+        streamer.settings.bet = set_default_settings(streamer.settings.bet, Settings.streamer_settings.bet)
+        try:
+            from TwitchChannelPointsMiner.classes.Chat import ChatPresence, ThreadChat
+            if streamer.settings.chat != ChatPresence.NEVER:
+                streamer.irc_chat = ThreadChat(miner.username, miner.twitch.twitch_login.get_auth_token(), streamer.username)
+        except Exception:
+            pass
+        miner.twitch.load_channel_points_context(streamer)
+        miner.twitch.check_streamer_online(streamer)
+    except Exception as e:
+        raise _GibdropStreamerUnavailable(e) from e
+    miner.streamers.append(streamer)
+    miner.original_streamers.append(streamer.channel_points)
+    miner.ws_pool.submit(PubsubTopic('video-playback-by-id', streamer=streamer))
+    if streamer.settings.follow_raid is True:
+        miner.ws_pool.submit(PubsubTopic('raid', streamer=streamer))
+    if streamer.settings.make_predictions is True:
+        miner.ws_pool.submit(PubsubTopic('predictions-channel-v1', streamer=streamer))
+    if getattr(streamer.settings, 'claim_moments', False) is True:
+        miner.ws_pool.submit(PubsubTopic('community-moments-channel-v1', streamer=streamer))
+
+def _gibdrop_remove_streamer(miner, username):
+    for index, streamer in enumerate(miner.streamers):
+        if streamer.username == username:
+            try:
+                streamer.leave_chat()
+            except Exception:
+                pass
+            del miner.streamers[index]
+            if index < len(miner.original_streamers):
+                del miner.original_streamers[index]
+            return
+
+def _gibdrop_sync_streamers(miner, skipped):
+    # skipped: {'wanted': list it was built for, 'names': set()} - names that couldn't be added, e.g.
+    # unknown logins or display names that mine() also drops. They're retried once the list changes.
+    wanted = [name.lower().strip() for name in load_active_streamers()]
+    if not wanted:
+        print('[gibdrop] Active streamer list is empty or unreadable, keeping the current streamers')
+        return
+    if skipped['wanted'] != wanted:
+        skipped['wanted'] = wanted
+        skipped['names'] = set()
+    current = [streamer.username for streamer in miner.streamers]
+    removed = [name for name in current if name not in wanted]
+    added = [name for name in dict.fromkeys(wanted) if name not in current and name not in skipped['names']]
+    for name in removed:
+        _gibdrop_remove_streamer(miner, name)
+    for name in added:
+        try:
+            _gibdrop_add_streamer(miner, name)
+        except _GibdropStreamerUnavailable as e:
+            skipped['names'].add(name)
+            print(f'[gibdrop] Could not add {name} ({e}), skipping it until the list changes')
+    # The list order is the watch priority; slice assignment swaps it in without the list ever looking empty.
+    # original_streamers shares indexes with streamers (removal and the session report rely on it), so it moves too.
+    rank = {name: i for i, name in reversed(list(enumerate(wanted)))}
+    order = sorted(range(len(miner.streamers)), key=lambda i: rank.get(miner.streamers[i].username, len(rank)))
+    if len(miner.original_streamers) == len(miner.streamers):
+        miner.original_streamers[:] = [miner.original_streamers[i] for i in order]
+    miner.streamers[:] = [miner.streamers[i] for i in order]
+    if added or removed:
+        failed = len([name for name in added if name in skipped['names']])
+        print(f'[gibdrop] Reloaded streamer list: +{len(added) - failed} -{len(removed)} ({len(miner.streamers)} total)')
+
+def start_streamer_watcher(miner, interval=STREAMER_RELOAD_INTERVAL):
+    def watch():
+        # run.py just loaded this list; only later changes need a sync
+        signature = _gibdrop_list_signature()
+        skipped = {'wanted': None, 'names': set()}
+        while True:
+            time.sleep(interval)
+            # Wait until mine() has logged in and opened the pubsub pool
+            if not getattr(miner, 'running', False) or getattr(miner, 'ws_pool', None) is None:
+                continue
+            new_signature = _gibdrop_list_signature()
+            if new_signature == signature:
+                continue
+            signature = new_signature
+            try:
+                _gibdrop_sync_streamers(miner, skipped)
+            except Exception as e:
+                # Only a half-applied add/remove gets here; a fresh run.py is the safe way back
+                print(f'[gibdrop] Live streamer reload failed ({e}), restarting run.py in place')
+                os.execv(sys.executable, [sys.executable] + sys.argv)
+    threading.Thread(target=watch, name='gibdrop-streamer-watcher', daemon=True).start()
+
+""" % RUNPY_RELOAD_INTERVAL
+
 # Patcher: Ensures run.py exists and is patched for dynamic streamer loading; manages dependency installation.
 class Patcher:
     def __init__(self, required_packages):
@@ -912,15 +2505,29 @@ class Patcher:
             else:
                 print("Neither run.py nor example.py found! Attempting to download example.py from GitHub...")
                 url = "https://raw.githubusercontent.com/rdavydov/Twitch-Channel-Points-Miner-v2/master/example.py"
+                started = time.perf_counter()
                 try:
+                    import urllib.request
                     urllib.request.urlretrieve(url, "example.py")
+                    TELEMETRY.record('http', 'GET example.py', started, status=200, bytes_in=os.path.getsize("example.py"))
                     print("Downloaded example.py from GitHub.")
                     shutil.copy("example.py", "run.py")
                     print("Copied downloaded example.py to run.py.")
                 except Exception as e:
+                    if not os.path.exists("example.py"):
+                        TELEMETRY.record('http', 'GET example.py', started, error=str(e))
                     print(f"Failed to download example.py: {e}")
                     sys.exit(1)
 
+    @staticmethod
+    def supports_hot_reload(runpy_path="run.py"):
+        """True if run.py was patched with the streamer list watcher, so new lists apply without a restart."""
+        try:
+            with open(runpy_path, "r", encoding="utf-8") as f:
+                return RUNPY_HOT_RELOAD_MARKER in f.read()
+        except OSError:
+            return False
+
     def patch_run_py(self):
         runpy_path = "run.py"
         backup_path = "run.py.bak"
@@ -963,6 +2570,9 @@ class Patcher:
             "    followers_order=FollowersOrder.ASC  # Sort the followers list by follow date. ASC or DESC\n"
             ")\n"
         )
+        watcher_call = "start_streamer_watcher(twitch_miner)  # [gibdrop] patched: hot-reload streamer list\n"
+        if watcher_call not in content[:start]:
+            replacement = watcher_call + replacement
         new_content = content[:start] + replacement + content[end+1:]
         # Insert import and streamer loading if not present
         import_lines = (
@@ -989,6 +2599,14 @@ class Patcher:
                 print("Inserted streamer loading logic for active_streamers.txt.")
             else:
                 print("Could not find Streamer import to insert streamer loading logic. Please check run.py.")
+        if RUNPY_HOT_RELOAD_MARKER not in new_content:
+            # Also upgrades run.py files patched before hot-reload existed
+            loader_line = "streamer_objects = [Streamer(name) for name in streamer_names]\n"
+            idx = new_content.find(loader_line)
+            if idx != -1:
+                insert_idx = idx + len(loader_line)
+                new_content = new_content[:insert_idx] + RUNPY_HOT_RELOAD_SOURCE + new_content[insert_idx:]
+                print("Inserted hot-reload of the active streamer list.")
         with open(runpy_path, "w", encoding="utf-8") as f:
             f.write(new_content)
         print("run.py patched successfully! If anything went wrong, restore from run.py.bak.")
@@ -1022,8 +2640,7 @@ class GibdropMenu:
         self.clear_screen()
 
     def set_active_streamers(self, filename):
-        with open("active_streamers.txt", "w", encoding="utf-8") as f:
-            f.write(filename)
+        return self.streamer_manager.set_active_streamers(filename)
 
     def set_default_streamers(self):
         print("Enter your default streamers (comma separated, e.g. streamer1, streamer2, streamer3):")
@@ -1076,66 +2693,33 @@ class GibdropMenu:
         
         self.press_any_key()
 
-    def browse_and_select_campaigns(self):
-        """Interactive campaign browser - shows current campaigns and lets user select which to add"""
-        print("🔍 Fetching current campaigns...")
-        campaigns = self.streamer_manager.get_current_campaigns()
-
-        # Always try to fetch Rust drops first
-        print("🦀 Fetching Rust drop streamers...")
-        rust_fetch_successful = False
-        try:
-            rust_streamers, streamer_drops, general_drops, campaign_start, campaign_end, is_active = self.streamer_manager.get_rust_drops()
+    def browse_and_select_campaigns(self, force_refresh=False):
+        """
+        Interactive campaign browser - shows current campaigns and lets user select which to add.
+        Cached discovery results are shown straight away; stale ones are refreshed in the background.
+        """
+        manager = self.streamer_manager
+        cached = {} if force_refresh else manager.load_cached_discovery()
+        results = {source: value for source, (value, fetched_at, is_fresh) in cached.items()}
+        stale_sources = [source for source, (value, fetched_at, is_fresh) in cached.items() if not is_fresh]
+        missing_sources = [source for source in DISCOVERY_SOURCES if source not in cached]
+        
+        if missing_sources:
+            # Nothing cached for these sources yet, so fetch them now
+            results.update(manager.refresh_discovery(missing_sources))
+            campaigns = manager.build_campaign_list(results.get("campaigns"), results.get("rust_drops"))
             
-            if rust_streamers and is_active:
-                # Format campaign dates for display
-                start_time = campaign_start.strftime('%Y-%m-%d %H:%M UTC') if campaign_start else ''
-                end_time = campaign_end.strftime('%Y-%m-%d %H:%M UTC') if campaign_end else ''
-                
-                total_drops = streamer_drops + general_drops
-                
-                # Create a virtual Rust campaign as the first option
-                rust_campaign = {
-                    'name': 'Rust Drop Streamers',
-                    'game': 'Rust',
-                    'slug': 'rust',
-                    'streamers': rust_streamers,
-                    'streamer_count': len(rust_streamers),
-                    'fetched_streamer_count': len(rust_streamers),
-                    'total_viewers': 0,
-                    'status': 'ACTIVE',
-                    'campaign_id': 'rust_drops',
-                    'start_time': start_time,
-                    'end_time': end_time,
-                    'details_url': 'https://twitch.facepunch.com/#drops',
-                    'image_url': '',
-                    'total_drops': total_drops,
-                    'streamer_drops': streamer_drops,
-                    'general_drops': general_drops,
-                    'type': 'RUST_DROPS',
-                    'is_active': is_active
-                }
-                
-                # Insert Rust campaign at the beginning
-                campaigns.insert(0, rust_campaign)
-                rust_fetch_successful = True
-                print(f"✅ Added Rust drops as campaign #1 ({len(rust_streamers)} streamers)")
-                
-                # Filter out duplicate Rust campaigns from Twitch inventory/dashboard
-                campaigns = [c for c in campaigns if c.get('game', '').lower() != 'rust' or c.get('type') == 'RUST_DROPS']
-                print(f"   🔍 Filtered out duplicate Rust campaigns from Twitch inventory")
-            elif campaign_start and not is_active:
-                print("⚠️ Rust campaign found but not currently active")
-            else:
-                print("⚠️ No Rust drop streamers found")
-        except Exception as e:
-            print(f"⚠️ Error fetching Rust streamers: {e}")
-
-        # Show logs/errors before clearing screen
-        print("\n(Review any logs above. Press Enter to continue...)")
-        input()
+            # Show logs/errors before clearing screen
+            print("\n(Review any logs above. Press Enter to continue...)")
+            input()
+        else:
+            campaigns = manager.build_campaign_list(results.get("campaigns"), results.get("rust_drops"))
+        
+        if stale_sources:
+            manager.start_background_refresh(stale_sources)
+        oldest_fetch = min((fetched_at for value, fetched_at, is_fresh in cached.values()), default=None)
 
-        if not campaigns:
+        if not campaigns and not manager.refresh_in_progress():
             print("❌ No active drop campaigns found.")
             print("\nThis could be because:")
             print("  • No drop campaigns are currently active on Twitch")
@@ -1149,80 +2733,107 @@ class GibdropMenu:
             self.press_any_key()
             return
 
-        # We only show real campaigns now
-        selected_campaigns = []
+        # Selection is a set of campaign ids, so toggling and redrawing stay O(1) per campaign. The saved
+        # list follows the displayed (priority) order, not the order campaigns were picked in.
+        campaign_index = {c.campaign_id: c for c in campaigns}
+        selected_ids = set()
+        refresh_note = ""
 
         while True:
+            # Swap in background refresh results as soon as they land, keeping the current selection
+            refreshed = manager.take_refresh_results()
+            if refreshed:
+                results.update({source: value for source, value in refreshed.items() if value})
+                campaigns = manager.build_campaign_list(results.get("campaigns"), results.get("rust_drops"))
+                campaign_index = {c.campaign_id: c for c in campaigns}
+                selected_ids &= campaign_index.keys()
+                oldest_fetch = None
+                refresh_note = "✅ Campaign list refreshed in the background"
+            elif manager.refresh_in_progress() and oldest_fetch:
+                age_minutes = int((time.time() - oldest_fetch) / 60)
+                refresh_note = f"🔄 Showing cached campaigns from {age_minutes} min ago - refreshing in the background..."
+
             self.clear_screen()
             self.print_ascii_art()
 
             print(f"\n🎮 ACTIVE DROP CAMPAIGNS ({len(campaigns)} found)")
             print("=" * 60)
+            if refresh_note:
+                print(f"   {refresh_note}")
+            if manager.timed_out_sources and not manager.refresh_in_progress():
+                late = ", ".join(DISCOVERY_SOURCE_LABELS.get(name, name) for name in manager.timed_out_sources)
+                print(f"   ⏱️  Timed out: {late} - showing what arrived in time (plus last known campaigns)")
+            if manager.failed_sources and not manager.refresh_in_progress():
+                failed = ", ".join(DISCOVERY_SOURCE_LABELS.get(name, name) for name in manager.failed_sources)
+                print(f"   ❌ Failed: {failed} - showing last known campaigns")
             print("   🦀 Rust = Rust drop streamers (from Facepunch)")
             print("   📋 Inventory = Campaigns you've joined (from Inventory API)")
             print("   🌐 Dashboard = Campaigns from ViewerDropsDashboard API")
             print()
 
+
+            selected_campaigns = [c for c in campaigns if c.campaign_id in selected_ids]
+
             # Display campaigns with selection status
             for i, campaign in enumerate(campaigns, 1):
-                status = "✓ SELECTED" if campaign in selected_campaigns else ""
+                status = "✓ SELECTED" if campaign.campaign_id in selected_ids else ""
 
                 # Show source type with emoji
                 source_emoji = {
                     'RUST_DROPS': '🦀',
                     'INVENTORY_CAMPAIGN': '📋',
                     'DASHBOARD_CAMPAIGN': '🌐'
-                }.get(campaign.get('type', 'INVENTORY_CAMPAIGN'), '🏆')
+                }.get(campaign.type, '🏆')
 
                 # Format display differently for Rust vs other campaigns
-                if campaign.get('type') == 'RUST_DROPS':
+                if campaign.is_rust:
                     # Rust: Show campaign name first (traditional format)
                     if status:
-                        print(f"{i:2}) [{status}] {source_emoji} {campaign['name']}")
+                        print(f"{i:2}) [{status}] {source_emoji} {campaign.name}")
                     else:
-                        print(f"{i:2}) {source_emoji} {campaign['name']}")
+                        print(f"{i:2}) {source_emoji} {campaign.name}")
                     
                     # Show Rust-specific details
-                    fetched_count = campaign.get('fetched_streamer_count', campaign.get('streamer_count', 0))
+                    fetched_count = campaign.fetched_streamer_count
                     if fetched_count > 0:
-                        total_drops = campaign.get('total_drops', 0)
-                        streamer_drops = campaign.get('streamer_drops', 0)
-                        general_drops = campaign.get('general_drops', 0)
-                        if total_drops > 0:
-                            print(f"     🎮 {campaign['game']} | 👥 {fetched_count} streamers | 🎁 {total_drops} Drops ({general_drops} general and {streamer_drops} streamer)")
+                        if campaign.drops_count > 0:
+                            print(f"     🎮 {campaign.game} | 👥 {fetched_count} streamers | 🎁 {campaign.drops_count} Drops ({campaign.general_drops} general and {campaign.streamer_drops} streamer)")
                         else:
-                            print(f"     🎮 {campaign['game']} | 👥 {fetched_count} streamers")
+                            print(f"     🎮 {campaign.game} | 👥 {fetched_count} streamers")
                     else:
-                        print(f"     🎮 {campaign['game']} | ❌ No eligible streamers found")
+                        print(f"     🎮 {campaign.game} | ❌ No eligible streamers found")
                 else:
                     # Other campaigns: Show game name first, then campaign details
                     if status:
-                        print(f"{i:2}) [{status}] 🎮 {campaign['game']}")
+                        print(f"{i:2}) [{status}] 🎮 {campaign.game}")
                     else:
-                        print(f"{i:2}) 🎮 {campaign['game']}")
+                        print(f"{i:2}) 🎮 {campaign.game}")
                     
                     # Show campaign details underneath
-                    fetched_count = campaign.get('fetched_streamer_count', campaign.get('streamer_count', 0))
-                    streamer_count = campaign.get('streamer_count', 0)
+                    fetched_count = campaign.fetched_streamer_count
                     if fetched_count > 0:
-                        if fetched_count > 50:
-                            print(f"     {source_emoji} {campaign['name']} | 👥 50+ active streamers (top {streamer_count} shown)")
-                        else:
-                            print(f"     {source_emoji} {campaign['name']} | 👥 {fetched_count} active streamers (top {streamer_count} shown)")
+                        # Lookups stop once the top streamers are found, so counts may be lower bounds
+                        more_label = "+" if campaign.more_streamers else ""
+                        viewers = campaign.total_viewers
+                        viewers_str = f" | 👀 {viewers:,}{more_label} viewers" if viewers else ""
+                        print(f"     {source_emoji} {campaign.name} | 👥 {fetched_count}{more_label} active streamers (top {campaign.streamer_count} shown){viewers_str}")
                     else:
-                        print(f"     {source_emoji} {campaign['name']} | ❌ No eligible streamers found")
+                        print(f"     {source_emoji} {campaign.name} | ❌ No eligible streamers found")
 
                 # Show campaign details
-                if campaign.get('type') == 'RUST_DROPS':
+                if campaign.is_rust:
                     # Show Rust campaign timing if available
-                    if campaign.get('start_time') and campaign.get('end_time'):
-                        print(f"     ⏰ {campaign['start_time']} → {campaign['end_time']}")
-                elif campaign.get('drops_count', 0) > 0:
-                    print(f"     🎁 {campaign['drops_count']} drops available")
+                    if campaign.start_time and campaign.end_time:
+                        print(f"     ⏰ {campaign.start_time} → {campaign.end_time}")
+                elif campaign.drops_count > 0:
+                    print(f"     🎁 {campaign.drops_count} drops available")
+                progress = campaign.progress_summary()
+                if progress:
+                    print(f"     {progress}")
             
             print("\n" + "=" * 60)
             if selected_campaigns:
-                total_selected_streamers = sum(len(c.get('streamers', [])) for c in selected_campaigns)
+                total_selected_streamers = sum(c.streamer_count for c in selected_campaigns)
                 print(f"🎯 Selected: {len(selected_campaigns)} campaigns, {total_selected_streamers} streamers")
             
             print("\n💡 Tip: If you're missing a campaign, you can edit selected_campaigns.txt and add the streamers you need")
@@ -1234,6 +2845,7 @@ class GibdropMenu:
             print("a) Select all campaigns")
             print("c) Clear all selections")
             print("i) Show campaign info")
+            print("r) Force refresh campaigns (ignore cache)")
             print("0) Cancel and return to main menu")
             
             choice = input("\nEnter your choice: ").strip().lower()
@@ -1249,23 +2861,19 @@ class GibdropMenu:
                 print(f"\n📋 STREAMERS IN SELECTED CAMPAIGNS")
                 print("=" * 50)
                 for campaign in selected_campaigns:
-                    streamer_list = campaign.get('streamers', [])
-                    count = len(streamer_list)
+                    count = campaign.streamer_count
                     if count > 0:
-                        if campaign.get('type') == 'RUST_DROPS':
-                            total_drops = campaign.get('total_drops', 0)
-                            streamer_drops = campaign.get('streamer_drops', 0)
-                            general_drops = campaign.get('general_drops', 0)
-                            if total_drops > 0:
-                                print(f"\n🦀 {campaign['name']} ({count} streamers | {total_drops} Drops - {general_drops} general and {streamer_drops} streamer):")
+                        if campaign.is_rust:
+                            if campaign.drops_count > 0:
+                                print(f"\n🦀 {campaign.name} ({count} streamers | {campaign.drops_count} Drops - {campaign.general_drops} general and {campaign.streamer_drops} streamer):")
                             else:
-                                print(f"\n🦀 {campaign['name']} ({count} streamers):")
+                                print(f"\n🦀 {campaign.name} ({count} streamers):")
                         else:
-                            print(f"\n🎮 {campaign['name']} (Top {count} by viewer count):")
-                        for i, streamer in enumerate(streamer_list, 1):
+                            print(f"\n🎮 {campaign.name} (Top {count} by viewer count):")
+                        for i, streamer in enumerate(campaign.streamers, 1):
                             print(f"  {i:2}. {streamer}")
                     else:
-                        print(f"\n🎮 {campaign['name']} (No streamers available)")
+                        print(f"\n🎮 {campaign.name} (No streamers available)")
                 
                 input("\nPress Enter to continue...")
                 continue
@@ -1283,30 +2891,29 @@ class GibdropMenu:
                 print("   - Only streamers eligible for these campaigns can drop rewards")
 
                 # Calculate total fetched streamers (not just top 5)
-                total_fetched = sum(c.get('fetched_streamer_count', c.get('streamer_count', 0)) for c in campaigns)
+                total_fetched = sum(c.fetched_streamer_count for c in campaigns)
                 print(f"\n Total campaigns: {len(campaigns)}")
                 print(f" Total available streamers: {total_fetched}")
 
                 if campaigns:
                     print(f"\n📅 Campaign Details:")
                     for campaign in campaigns:
-                        fetched_count = campaign.get('fetched_streamer_count', campaign.get('streamer_count', 0))
-                        if campaign.get('type') == 'RUST_DROPS':
-                            drops_count = campaign.get('drops_count', 0)
-                            if drops_count > 0:
-                                streamer_str = f"{fetched_count} streamers with drops + {drops_count} general drops"
+                        fetched_count = campaign.fetched_streamer_count
+                        if campaign.is_rust:
+                            if campaign.general_drops > 0:
+                                streamer_str = f"{fetched_count} streamers with drops + {campaign.general_drops} general drops"
                             else:
                                 streamer_str = f"{fetched_count} streamers with drops"
-                        elif fetched_count > 50:
-                            shown_count = min(5, campaign.get('streamer_count', 0))
-                            streamer_str = f"50+ active streamers (top {shown_count} shown)"
+                        elif campaign.more_streamers:
+                            shown_count = min(5, campaign.streamer_count)
+                            streamer_str = f"{fetched_count}+ active streamers (top {shown_count} shown)"
                         else:
                             shown_count = min(5, fetched_count) if fetched_count > 0 else 0
                             streamer_str = f"{fetched_count} active streamer{'s' if fetched_count != 1 else ''} (top {shown_count} shown)"
-                        print(f"   • {campaign['name']} ({campaign['game']})")
+                        print(f"   • {campaign.name} ({campaign.game})")
                         print(f"     - {streamer_str}")
-                        if campaign.get('drops_count') and campaign.get('type') != 'RUST_DROPS':
-                            print(f"     - {campaign['drops_count']} drop rewards")
+                        if campaign.drops_count and not campaign.is_rust:
+                            print(f"     - {campaign.drops_count} drop rewards")
 
                 input("\nPress Enter to continue...")
                 continue
@@ -1317,36 +2924,10 @@ class GibdropMenu:
                     input("Press Enter to continue...")
                     continue
                 
-                # Combine all selected streamers
-                all_selected_streamers = []
-                
-                for campaign in selected_campaigns:
-                    streamers = campaign.get('streamers', [])
-                    all_selected_streamers.extend(streamers)
-                
-                # Remove duplicates while preserving order
-                unique_streamers = []
-                seen = set()
-                for streamer in all_selected_streamers:
-                    if streamer not in seen:
-                        unique_streamers.append(streamer)
-                        seen.add(streamer)
-                
                 # Save combined file and individual campaign files
                 combined_filename = "selected_campaigns.txt"
-                self.streamer_manager.save_default_streamers(unique_streamers, combined_filename)
-                
-                # Also save individual campaign files for reference
-                for campaign in selected_campaigns:
-                    if campaign.get('type') == 'RUST_DROPS':
-                        individual_filename = "rust_drop_streamers.txt"
-                    else:
-                        safe_name = "".join(c for c in campaign['name'] if c.isalnum() or c in (' ', '-', '_')).strip()
-                        individual_filename = f"campaign_{safe_name.replace(' ', '_').lower()}.txt"
-                    
-                    campaign_streamers = campaign.get('streamers', [])
-                    if campaign_streamers:
-                        self.streamer_manager.save_default_streamers(campaign_streamers, individual_filename)
+                previous_streamers = manager.load_active_streamers()
+                unique_streamers = manager.save_campaign_selection(selected_campaigns, combined_filename)
                 
                 print(f"\n✅ SAVED SUCCESSFULLY!")
                 print(f"📁 Combined file: {combined_filename} ({len(unique_streamers)} unique streamers)")
@@ -1355,19 +2936,40 @@ class GibdropMenu:
                 set_active = input(f"\nSet streamers as active? (y/n): ").strip().lower()
                 if set_active == 'y':
                     self.set_active_streamers(combined_filename)
-                    print("✅ Streamers set as active!")
+                    if manager.load_active_streamers() == previous_streamers:
+                        print("✅ Active streamer list unchanged, nothing to apply")
+                    else:
+                        print("✅ Streamers set as active!")
+                        if Patcher.supports_hot_reload():
+                            print(f"♻️ The running miner picks up the new list within {RUNPY_RELOAD_INTERVAL}s, no restart needed")
                 
                 input("\nPress Enter to continue...")
                 return
                 
+            elif choice == "r":
+                if manager.refresh_in_progress():
+                    print("\n⏳ Waiting for the background refresh to finish...")
+                    manager.wait_for_background_refresh()
+                    manager.take_refresh_results()
+                print()
+                results = manager.refresh_discovery()
+                campaigns = manager.build_campaign_list(results.get("campaigns"), results.get("rust_drops"))
+                campaign_index = {c.campaign_id: c for c in campaigns}
+                selected_ids &= campaign_index.keys()
+                refresh_note = "✅ Campaign list refreshed"
+                input("\nPress Enter to continue...")
+                continue
+                
             elif choice == "a":
-                selected_campaigns = campaigns.copy()
-                print(f"\n✅ Selected all {len(campaigns)} campaigns!")
+                # Campaigns that can't earn anything more would only take watch slots
+                selected_ids = {c.campaign_id for c in campaigns if c.earnable}
+                skipped = len(campaigns) - len(selected_ids)
+                print(f"\n✅ Selected all {len(selected_ids)} campaigns that can still earn drops!" + (f" (skipped {skipped})" if skipped else ""))
                 input("Press Enter to continue...")
                 continue
                 
             elif choice == "c":
-                selected_campaigns.clear()
+                selected_ids.clear()
                 print("\n🗑️ Cleared all selections.")
                 input("Press Enter to continue...")
                 continue
@@ -1398,21 +3000,21 @@ class GibdropMenu:
                     
                     for campaign_num in campaign_numbers:
                         campaign = campaigns[campaign_num - 1]
-                        if campaign in selected_campaigns:
-                            selected_campaigns.remove(campaign)
+                        if campaign.campaign_id in selected_ids:
+                            selected_ids.discard(campaign.campaign_id)
                             deselected_count += 1
-                            print(f"❌ Deselected: {campaign['name']}")
+                            print(f"❌ Deselected: {campaign.name}")
                         else:
-                            selected_campaigns.append(campaign)
+                            selected_ids.add(campaign.campaign_id)
                             selected_count += 1
-                            streamer_count = len(campaign.get('streamers', []))
+                            streamer_count = campaign.streamer_count
                             if streamer_count > 0:
-                                if campaign.get('type') == 'RUST_DROPS':
-                                    print(f"✅ Selected: {campaign['name']} ({streamer_count} Rust streamers)")
+                                if campaign.is_rust:
+                                    print(f"✅ Selected: {campaign.name} ({streamer_count} Rust streamers)")
                                 else:
-                                    print(f"✅ Selected: {campaign['name']} (Top {streamer_count} by viewers)")
+                                    print(f"✅ Selected: {campaign.name} (Top {streamer_count} by viewers)")
                             else:
-                                print(f"✅ Selected: {campaign['name']} (No streamers)")
+                                print(f"✅ Selected: {campaign.name} (No streamers)")
                     
                     # Summary message
                     if selected_count > 0 and deselected_count > 0:
@@ -1509,21 +3111,13 @@ class GibdropMenu:
         self.press_any_key()
 
     def _check_docker_available(self):
-        """Check if Docker is available and accessible."""
-        import subprocess
-        try:
-            result = subprocess.run(["docker", "--version"], capture_output=True, text=True, timeout=5)
-            if result.returncode != 0:
-                print("❌ Docker is not available or not accessible.")
-                print("💡 Make sure Docker is installed and running.")
-                self.press_any_key()
-                return False
+        """Check if Docker is available and accessible (engine socket ping, docker CLI as fallback)."""
+        if gibdrop_dockermgr.docker_available():
             return True
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            print("❌ Docker is not available or not accessible.")
-            print("💡 Make sure Docker is installed and running.")
-            self.press_any_key()
-            return False
+        print("❌ Docker is not available or not accessible.")
+        print("💡 Make sure Docker is installed and running.")
+        self.press_any_key()
+        return False
 
     def main_menu(self):
         while True:
@@ -1566,9 +3160,351 @@ class GibdropMenu:
                 print("Invalid choice. Please try again.")
                 self.press_any_key()
 
+# --- Headless CLI ---
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_NOTHING_FOUND = 3  # 2 is taken by argparse usage errors
+DAEMON_MIN_INTERVAL = 5 * 60        # Poll this often around campaign starts/ends (seconds)
+DAEMON_MAX_INTERVAL = 60 * 60       # Poll this often when nothing is about to change (seconds)
+DAEMON_BOUNDARY_WINDOW = 30 * 60    # How close to a start/end counts as "around" it (seconds)
+
+def parse_twitch_time(value):
+    """Parse a Twitch ISO timestamp ('2025-06-01T17:00:00Z') into an aware datetime, or None."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+def streamer_set_changed(previous_streamers, streamers):
+    """True if the active list gained or lost streamers; a new ranking of the same ones doesn't count."""
+    return {name.lower() for name in streamers} != {name.lower() for name in previous_streamers}
+
+def apply_streamer_change():
+    """
+    Get a changed active list into the miner: nothing to do with a hot-reloading run.py, otherwise
+    restart the container. Returns False if the restart was needed but failed.
+    """
+    if Patcher.supports_hot_reload():
+        print(f"♻️ The running miner picks up the new list within {RUNPY_RELOAD_INTERVAL}s, no restart needed")
+        return True
+    if not gibdrop_dockermgr.docker_available():
+        print("⚠️  Docker is not available, skipping container restart")
+        return False
+    success = gibdrop_dockermgr.restart_container(interactive=False)
+    reset_terminal_colors()  # Reset colors after Docker restart
+    return success
+
+# GibdropDaemon: Keeps one process alive that re-runs discovery, rewrites selected_campaigns.txt and applies it.
+# Polls quickly around known campaign starts/ends and backs off when nothing is about to change.
+class GibdropDaemon:
+    def __init__(self, streamer_manager, select_campaigns, restart=True,
+                 min_interval=DAEMON_MIN_INTERVAL, max_interval=DAEMON_MAX_INTERVAL, boundary_window=DAEMON_BOUNDARY_WINDOW):
+        self.streamer_manager = streamer_manager
+        self.select_campaigns = select_campaigns
+        self.restart = restart
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.boundary_window = boundary_window
+        self.stop_event = threading.Event()
+
+    def campaign_boundaries(self, results):
+        """
+        Every known campaign start/end time from the Facepunch and Inventory/Dashboard results, plus the
+        starts of upcoming Twitch campaigns (only active ones are listed, so their startAt is already past).
+        """
+        boundaries = list(self.streamer_manager.upcoming_campaign_starts)
+        rust_drops = results.get("rust_drops")
+        if rust_drops:
+            boundaries.extend(moment for moment in rust_drops[3:5] if moment)
+        for campaign in results.get("campaigns") or []:
+            for value in (campaign.start_time, campaign.end_time):
+                moment = parse_twitch_time(value)
+                if moment:
+                    boundaries.append(moment)
+        return boundaries
+
+    def next_poll_interval(self, boundaries, now=None):
+        """
+        Seconds until the next poll: min_interval while within boundary_window of any start/end,
+        otherwise wake up when the next window opens, capped at max_interval.
+        """
+        now = now or datetime.now(timezone.utc)
+        interval = self.max_interval
+        for moment in boundaries:
+            delta = (moment - now).total_seconds()
+            if abs(delta) <= self.boundary_window:
+                return self.min_interval
+            if delta > 0:
+                interval = min(interval, delta - self.boundary_window)
+        return max(self.min_interval, interval)
+
+    def run_once(self):
+        """One discovery/select/apply cycle. Returns the seconds to wait before the next one."""
+        manager = self.streamer_manager
+        results = manager.get_discovery_results(force_refresh=True)
+        campaigns = manager.build_campaign_list(results.get("campaigns"), results.get("rust_drops"))
+        selected = self.select_campaigns(campaigns)
+        
+        combined_filename = "selected_campaigns.txt"
+        if selected:
+            previous_streamers = manager.load_active_streamers()
+            unique_streamers = manager.save_campaign_selection(selected, combined_filename)
+            manager.set_active_streamers(combined_filename)
+            # Only the list the miner actually reads matters; unchanged means no restart and no downtime.
+            # A new ranking of the same streamers is written but not worth a restart on its own.
+            active_streamers = manager.load_active_streamers()
+            changed = streamer_set_changed(previous_streamers, active_streamers)
+            state = 'changed' if changed else 'reordered' if active_streamers != previous_streamers else 'unchanged'
+            print(f"✅ {len(selected)} campaigns, {len(unique_streamers)} streamers ({state})")
+            if changed and self.restart:
+                apply_streamer_change()
+        else:
+            print("ℹ️ No active campaigns matched the selection, keeping the current streamer list")
+        
+        return self.next_poll_interval(self.campaign_boundaries(results))
+
+    def run(self, once=False):
+        def stop(signum, frame):
+            print("\n🛑 Stopping gibdrop daemon...")
+            self.stop_event.set()
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        
+        while not self.stop_event.is_set():
+            started = datetime.now(timezone.utc)
+            print(f"\n🔁 [{started.strftime('%Y-%m-%d %H:%M:%S UTC')}] Running discovery...")
+            try:
+                interval = self.run_once()
+            except Exception as e:
+                print(f"❌ Daemon cycle failed: {e}")
+                interval = self.min_interval
+            if once:
+                break
+            next_run = datetime.now(timezone.utc).timestamp() + interval
+            print(f"💤 Next discovery in {int(interval / 60)} min ({datetime.fromtimestamp(next_run, tz=timezone.utc).strftime('%H:%M UTC')})")
+            self.stop_event.wait(interval)
+        return EXIT_OK
+
+# GibdropCLI: Prompt-free subcommands for cron/systemd that reuse the same StreamerManager, Patcher and docker code as the menu.
+class GibdropCLI:
+    def __init__(self, streamer_manager, patcher):
+        self.streamer_manager = streamer_manager
+        self.patcher = patcher
+
+    def build_parser(self):
+        parser = argparse.ArgumentParser(
+            prog="gibdrop.py",
+            description="Run without arguments for the interactive menu, or use a subcommand for scheduled runs.",
+        )
+        parser.add_argument("--timings", action="store_true", help=f"print a per-request network summary after each discovery (or set {TIMINGS_ENV}=1)")
+        parser.add_argument("--timings-log", metavar="FILE", help=f"append one JSON line per outbound request to FILE (or set {TIMINGS_LOG_ENV})")
+        parser.add_argument("--rate-limit", metavar="RATE[/BURST]", type=TokenBucket.parse,
+                            help=f"max Twitch/Facepunch requests per second, 0 for no limit (default {RATE_LIMIT:g}/{RATE_LIMIT_BURST}, or set {RATE_LIMIT_ENV})")
+        subparsers = parser.add_subparsers(dest="command", required=True)
+
+        refresh = subparsers.add_parser("refresh", help="Discover campaigns and update the discovery cache")
+        refresh.add_argument("--force", action="store_true", help="ignore cached results")
+        refresh.add_argument("--count", action="store_true", help="count every drops-enabled streamer (slower)")
+        refresh.set_defaults(handler=self.cmd_refresh)
+
+        select = subparsers.add_parser("select", help="Save streamers for matching campaigns to selected_campaigns.txt")
+        which = select.add_mutually_exclusive_group(required=True)
+        which.add_argument("--all", action="store_true", help="select every active campaign")
+        which.add_argument("--game", action="append", metavar="NAME", help="select campaigns for this game (repeatable)")
+        which.add_argument("--campaign", action="append", metavar="ID", help="select a campaign by id (repeatable)")
+        select.add_argument("--force", action="store_true", help="ignore cached results")
+        select.add_argument("--activate", action="store_true", help="also set selected_campaigns.txt as the active list")
+        select.add_argument("--restart-if-changed", action="store_true",
+                            help="imply --activate and restart the miner container if the active streamers changed (not needed with hot-reload)")
+        select.set_defaults(handler=self.cmd_select)
+
+        activate = subparsers.add_parser("activate", help="Point active_streamers.txt at a streamer list")
+        activate.add_argument("filename", nargs="?", default="selected_campaigns.txt")
+        activate.set_defaults(handler=self.cmd_activate)
+
+        restart = subparsers.add_parser("restart", help="Restart the miner container to apply the active list")
+        restart.set_defaults(handler=self.cmd_restart)
+
+        status = subparsers.add_parser("status", help="Show miner container and streamer list status")
+        status.add_argument("--json", action="store_true", help="print machine-readable JSON")
+        status.set_defaults(handler=self.cmd_status)
+
+        daemon = subparsers.add_parser("daemon", help="Keep running: rediscover on a schedule and apply the selection")
+        which = daemon.add_mutually_exclusive_group()
+        which.add_argument("--game", action="append", metavar="NAME", help="only select campaigns for this game (repeatable)")
+        which.add_argument("--campaign", action="append", metavar="ID", help="only select this campaign id (repeatable)")
+        daemon.add_argument("--no-restart", action="store_true", help="update the streamer files but don't restart the container")
+        daemon.add_argument("--min-interval", type=int, default=DAEMON_MIN_INTERVAL, metavar="SECONDS", help="poll interval around campaign starts/ends")
+        daemon.add_argument("--max-interval", type=int, default=DAEMON_MAX_INTERVAL, metavar="SECONDS", help="poll interval when nothing is about to change")
+        daemon.add_argument("--count", action="store_true", help="count every drops-enabled streamer (slower)")
+        daemon.add_argument("--once", action="store_true", help="run a single cycle and exit")
+        daemon.set_defaults(handler=self.cmd_daemon, all=False)
+
+        patch = subparsers.add_parser("patch", help="Ensure run.py exists and patch it for dynamic streamer loading")
+        patch.set_defaults(handler=self.cmd_patch)
+        return parser
+
+    def run(self, argv):
+        args = self.build_parser().parse_args(argv)
+        if args.timings:
+            TELEMETRY.show_summary = True
+        if args.timings_log:
+            TELEMETRY.log_path = args.timings_log
+        if args.rate_limit:
+            RATE_LIMITER.configure(*args.rate_limit)
+        try:
+            return args.handler(args)
+        except KeyboardInterrupt:
+            return EXIT_ERROR
+        finally:
+            # Requests made outside a discovery (e.g. the example.py download for `patch`)
+            if TELEMETRY.show_summary:
+                TELEMETRY.print_summary()
+
+    def _load_campaigns(self, force_refresh):
+        manager = self.streamer_manager
+        results = manager.get_discovery_results(force_refresh=force_refresh)
+        return manager.build_campaign_list(results.get("campaigns"), results.get("rust_drops"))
+
+    def cmd_refresh(self, args):
+        if args.count:
+            self.streamer_manager.count_streamers = True
+        campaigns = self._load_campaigns(args.force)
+        print(f"🎯 {len(campaigns)} active campaigns")
+        for campaign in campaigns:
+            print(f"   • [{campaign.campaign_id}] {campaign.name} ({campaign.game}) - {campaign.streamer_count} streamers")
+        return EXIT_OK if campaigns else EXIT_NOTHING_FOUND
+
+    def _filter_campaigns(self, campaigns, args):
+        """
+        Apply --game/--campaign filters; with neither given every campaign is selected. Campaigns that
+        can't earn any more drops are left out unless picked explicitly with --campaign.
+        """
+        if args.campaign:
+            campaign_ids = set(args.campaign)
+            return [c for c in campaigns if c.campaign_id in campaign_ids]
+        if args.game:
+            games = {game.lower() for game in args.game}
+            campaigns = [c for c in campaigns if c.game.lower() in games]
+        unearnable = [c for c in campaigns if not c.earnable]
+        if unearnable:
+            print(f"⏭️  Skipping {len(unearnable)} campaign(s) that are complete or can't finish in time: {', '.join(c.name for c in unearnable)}")
+        return [c for c in campaigns if c.earnable]
+
+    def cmd_select(self, args):
+        campaigns = self._load_campaigns(args.force)
+        selected = self._filter_campaigns(campaigns, args)
+        
+        if not selected:
+            print("❌ No active campaigns matched the selection")
+            return EXIT_NOTHING_FOUND
+        
+        combined_filename = "selected_campaigns.txt"
+        previous_streamers = self.streamer_manager.load_active_streamers()
+        unique_streamers = self.streamer_manager.save_campaign_selection(selected, combined_filename)
+        print(f"✅ Saved {len(selected)} campaigns to {combined_filename} ({len(unique_streamers)} unique streamers)")
+        if args.activate or args.restart_if_changed:
+            self.streamer_manager.set_active_streamers(combined_filename)
+            active_streamers = self.streamer_manager.load_active_streamers()
+            if active_streamers == previous_streamers:
+                print("✅ Active streamer list unchanged, nothing to apply")
+            elif not args.restart_if_changed:
+                print("✅ Streamers set as active!")
+                self._print_hot_reload_hint()
+            elif streamer_set_changed(previous_streamers, active_streamers):
+                print("✅ Streamers set as active!")
+                if not apply_streamer_change():
+                    return EXIT_ERROR
+            else:
+                print("✅ Streamers set as active (same streamers, new order; no restart needed)")
+        return EXIT_OK if unique_streamers else EXIT_NOTHING_FOUND
+
+    def cmd_activate(self, args):
+        if not os.path.isfile(args.filename):
+            print(f"❌ {args.filename} not found")
+            return EXIT_ERROR
+        previous_streamers = self.streamer_manager.load_active_streamers()
+        self.streamer_manager.set_active_streamers(args.filename)
+        if self.streamer_manager.load_active_streamers() != previous_streamers:
+            print(f"✅ {args.filename} set as active")
+            self._print_hot_reload_hint()
+        else:
+            print("✅ Active streamer list unchanged, nothing to apply")
+        return EXIT_OK
+
+    def _print_hot_reload_hint(self):
+        if Patcher.supports_hot_reload():
+            print(f"♻️ The running miner picks up the new list within {RUNPY_RELOAD_INTERVAL}s, no restart needed")
+        else:
+            print("ℹ️ Restart the miner to apply the new list (re-run 'patch' to enable hot-reload)")
+
+    def cmd_restart(self, args):
+        if not gibdrop_dockermgr.docker_available():
+            print("❌ Docker is not available or not accessible.")
+            return EXIT_ERROR
+        success = gibdrop_dockermgr.restart_container(interactive=False)
+        reset_terminal_colors()  # Reset colors after Docker restart
+        return EXIT_OK if success else EXIT_ERROR
+
+    def cmd_status(self, args):
+        manager = self.streamer_manager
+        docker_available = gibdrop_dockermgr.docker_available()
+        container = gibdrop_dockermgr.get_container_status() if docker_available else None
+        
+        if args.json:
+            try:
+                with open("active_streamers.txt", "r", encoding="utf-8") as f:
+                    active_file = f.read().strip() or None
+            except FileNotFoundError:
+                active_file = None
+            cache = {
+                source: {
+                    'fetched_at': datetime.fromtimestamp(fetched_at, tz=timezone.utc).isoformat(),
+                    'fresh': is_fresh,
+                }
+                for source, (value, fetched_at, is_fresh) in manager.load_cached_discovery().items()
+            }
+            print(json.dumps({
+                'docker_available': docker_available,
+                'container': container,
+                'active_streamers': {'file': active_file, 'count': len(manager.load_active_streamers())},
+                'discovery_cache': cache,
+            }, indent=2))
+        elif not docker_available:
+            print("❌ Docker is not available or not accessible.")
+        else:
+            gibdrop_dockermgr.check_container_status()
+            reset_terminal_colors()  # Reset colors after Docker status check
+        
+        if not docker_available:
+            return EXIT_ERROR
+        return EXIT_OK if container and container['running'] else EXIT_NOTHING_FOUND
+
+    def cmd_daemon(self, args):
+        if args.count:
+            self.streamer_manager.count_streamers = True
+        daemon = GibdropDaemon(
+            self.streamer_manager,
+            lambda campaigns: self._filter_campaigns(campaigns, args),
+            restart=not args.no_restart,
+            min_interval=args.min_interval,
+            max_interval=max(args.min_interval, args.max_interval),
+        )
+        return daemon.run(once=args.once)
+
+    def cmd_patch(self, args):
+        self.patcher.ensure_run_py()
+        self.patcher.patch_run_py()
+        return EXIT_OK
+
 def main():
+    ensure_dependencies()
     streamer_manager = StreamerManager()
     patcher = Patcher(REQUIRED_PACKAGES)
+    if len(sys.argv) > 1:
+        sys.exit(GibdropCLI(streamer_manager, patcher).run(sys.argv[1:]))
     menu = GibdropMenu(streamer_manager, patcher)
     menu.main_menu()
 
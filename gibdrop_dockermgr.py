@@ -1,6 +1,13 @@
 import subprocess
 import os
+import shutil
 import sys
+import json
+import hashlib
+import select
+import socket
+import time
+from urllib.parse import quote, urlencode
 
 def reset_terminal_colors():
     """Reset terminal colors to default after Docker operations that may leave ANSI color codes active."""
@@ -10,6 +17,8 @@ DOCKERFILE = "Dockerfile.patched"
 IMAGE_NAME = "gibdrop-miner-patched"
 IMAGE_TAG = "latest"
 FULL_IMAGE = f"{IMAGE_NAME}:{IMAGE_TAG}"
+BUILD_INPUTS = [DOCKERFILE, "requirements.txt"]  # Files whose content decides whether the image is current
+BUILD_HASH_LABEL = "gibdrop.build-hash"
 
 # Files to mount (edit as needed)
 MOUNT_FILES = [
@@ -29,10 +38,294 @@ TXT_FILES = [
 
 CONTAINER_NAME = "twitch-farmer-gibdrop"
 
+DOCKER_SOCKET = "/var/run/docker.sock"
+DOCKER_API_TIMEOUT = 30  # seconds; a restart waits up to DOCKER_STOP_TIMEOUT for the miner to exit
+DOCKER_STOP_TIMEOUT = 10
+
+class DockerAPIError(Exception):
+    def __init__(self, status, message):
+        super().__init__(f"Docker API {status}: {message}")
+        self.status = status
+
+class DockerAPI:
+    """
+    Minimal Docker Engine API client over the unix socket.
+    One keep-alive connection is reused for every call, so a status check or restart is a
+    single HTTP round trip instead of one `docker` process per question.
+    """
+    def __init__(self, socket_path=DOCKER_SOCKET, timeout=DOCKER_API_TIMEOUT):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.connection = None
+
+    def _open_socket(self, timeout=None):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout or self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def _connect(self, timeout=None):
+        import http.client
+        api = self
+
+        class UnixHTTPConnection(http.client.HTTPConnection):
+            def connect(self):
+                self.sock = api._open_socket(self.timeout)
+
+        return UnixHTTPConnection("localhost", timeout=timeout or self.timeout)
+
+    def request(self, method, path, query=None, body=None):
+        """Send one request and return (status, body bytes). Reconnects once if the kept-alive connection went away."""
+        import http.client
+        url = path + ("?" + urlencode(query) if query else "")
+        payload = json.dumps(body).encode("utf-8") if body is not None else None
+        headers = {"Content-Type": "application/json"} if payload is not None else {}
+        for attempt in range(2):
+            if self.connection is None:
+                self.connection = self._connect()
+            try:
+                self.connection.request(method, url, body=payload, headers=headers)
+                response = self.connection.getresponse()
+                return response.status, response.read()
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                self.close()
+                if attempt:
+                    raise
+            except Exception:
+                self.close()
+                raise
+
+    def call(self, method, path, query=None, body=None, expect=(200, 201, 204, 304)):
+        status, data = self.request(method, path, query, body)
+        if status not in expect:
+            raise DockerAPIError(status, error_message(data))
+        return status, data
+
+    def ping(self):
+        try:
+            return self.call("GET", "/_ping")[1].strip() == b"OK"
+        except (OSError, DockerAPIError):
+            return False
+
+    def inspect_container(self, name):
+        """Container JSON, or None if there is no such container."""
+        status, data = self.call("GET", f"/containers/{quote(name)}/json", expect=(200, 404))
+        return json.loads(data) if status == 200 else None
+
+    def inspect_image(self, image):
+        """Image JSON, or None if the image does not exist."""
+        status, data = self.call("GET", f"/images/{quote(image, safe='')}/json", expect=(200, 404))
+        return json.loads(data) if status == 200 else None
+
+    def container_logs(self, name, tail=10):
+        _, data = self.call("GET", f"/containers/{quote(name)}/logs", {"stdout": 1, "stderr": 1, "tail": tail})
+        return demux_logs(data)
+
+    def follow_logs(self, name, tail=20, duration=10, out=None):
+        """
+        Stream logs to out (stdout) for up to duration seconds on a separate connection.
+        The request is HTTP/1.0, so the body is the bare log stream until the engine closes it, and
+        every read waits in select() for the time left, so a quiet gap in the logs doesn't end it.
+        """
+        out = out or sys.stdout
+        deadline = time.monotonic() + duration
+        query = urlencode({"stdout": 1, "stderr": 1, "follow": 1, "tail": tail})
+        sock = self._open_socket()
+        try:
+            sock.sendall(f"GET /containers/{quote(name)}/logs?{query} HTTP/1.0\r\nHost: localhost\r\n\r\n".encode("ascii"))
+            head = b""
+            pending = None  # Body bytes not written yet; None until the headers are through
+            for chunk in recv_until(sock, deadline):
+                if pending is None:
+                    head += chunk
+                    if b"\r\n\r\n" not in head:
+                        continue
+                    head, _, chunk = head.partition(b"\r\n\r\n")
+                    status = int(head.split(b" ", 2)[1])
+                    if status != 200:
+                        body = chunk + b"".join(recv_until(sock, deadline))
+                        raise DockerAPIError(status, error_message(body))
+                    pending = b""
+                data = pending + chunk
+                if len(data) < 8 and data[:1] in (b"\0", b"\1", b"\2"):
+                    pending = data  # Part of a frame header; wait for the rest
+                    continue
+                text, pending = demux_log_chunk(data)
+                out.write(text)
+                out.flush()
+        finally:
+            sock.close()
+
+    def restart_container(self, name, stop_timeout=DOCKER_STOP_TIMEOUT):
+        """Restart in one call; returns False if the container does not exist."""
+        status, _ = self.call("POST", f"/containers/{quote(name)}/restart", {"t": stop_timeout}, expect=(204, 404))
+        return status == 204
+
+    def stop_container(self, name, stop_timeout=DOCKER_STOP_TIMEOUT):
+        self.call("POST", f"/containers/{quote(name)}/stop", {"t": stop_timeout})
+
+    def remove_container(self, name):
+        self.call("DELETE", f"/containers/{quote(name)}", expect=(204, 404))
+
+    def create_container(self, name, config):
+        _, data = self.call("POST", "/containers/create", {"name": name}, body=config)
+        return json.loads(data)["Id"]
+
+    def start_container(self, name):
+        self.call("POST", f"/containers/{quote(name)}/start")
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+def error_message(data):
+    """The message of an engine error response, or its raw text."""
+    try:
+        return json.loads(data).get("message", "")
+    except (ValueError, AttributeError):
+        return data.decode("utf-8", "replace").strip()
+
+def recv_until(sock, deadline):
+    """Yield what arrives on sock until it closes or the monotonic deadline passes, waiting in select() between reads."""
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        readable, _, _ = select.select([sock], [], [], remaining)
+        if not readable:
+            return
+        chunk = sock.recv(4096)
+        if not chunk:
+            return
+        yield chunk
+
+def demux_log_chunk(data):
+    """
+    Split a log stream into (text, leftover bytes).
+    Containers without a TTY prefix every write with an 8-byte header (stream, 0, 0, 0, size);
+    TTY containers send raw bytes. Leftover is an incomplete frame to prepend to the next chunk.
+    """
+    if len(data) < 8 or data[0] not in (0, 1, 2) or data[1:4] != b"\0\0\0":
+        return data.decode("utf-8", "replace"), b""
+    parts = []
+    while len(data) >= 8:
+        size = int.from_bytes(data[4:8], "big")
+        if len(data) < 8 + size:
+            break
+        parts.append(data[8:8 + size])
+        data = data[8 + size:]
+    return b"".join(parts).decode("utf-8", "replace"), data
+
+def demux_logs(data):
+    return demux_log_chunk(data)[0]
+
+_docker_api = None
+
+def docker_api():
+    """
+    The shared DockerAPI if the engine socket is reachable, otherwise None (callers fall back to the CLI).
+    DOCKER_HOST is honoured for unix:// sockets; any other DOCKER_HOST is left to the CLI.
+    """
+    global _docker_api
+    if _docker_api is None:
+        host = os.environ.get("DOCKER_HOST", "")
+        if host and not host.startswith("unix://"):
+            _docker_api = False
+        else:
+            socket_path = host[len("unix://"):] if host else DOCKER_SOCKET
+            api = DockerAPI(socket_path)
+            _docker_api = api if os.path.exists(socket_path) and api.ping() else False
+    return _docker_api or None
+
+def docker_available():
+    """True if the Docker engine (API socket) or at least the docker CLI is usable."""
+    if docker_api():
+        return True
+    if not shutil.which("docker"):
+        return False
+    try:
+        result = subprocess.run(["docker", "--version"], capture_output=True, text=True, timeout=5)
+        return result.returncode == 0
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+        return False
+
+def get_container_status():
+    """
+    Return the container state as a dict for scripting: name, exists, running, status and image.
+    """
+    status = {"name": CONTAINER_NAME, "exists": False, "running": False, "status": None, "image": None}
+    api = docker_api()
+    if api:
+        try:
+            info = api.inspect_container(CONTAINER_NAME)
+            if info:
+                state = info.get("State") or {}
+                image = (info.get("Config") or {}).get("Image")
+                status.update({"exists": True, "running": bool(state.get("Running")), "status": state.get("Status"), "image": image or None})
+            return status
+        except (OSError, DockerAPIError):
+            pass  # Quietly use the CLI, callers may be printing JSON
+    inspect_cmd = ["docker", "inspect", "-f", "{{.State.Status}}\t{{.State.Running}}\t{{.Config.Image}}", CONTAINER_NAME]
+    result = subprocess.run(inspect_cmd, capture_output=True, text=True)
+    if result.returncode != 0 or not result.stdout.strip():
+        return status
+    state, running, image = (result.stdout.strip().split("\t") + ["", "", ""])[:3]
+    status.update({"exists": True, "running": running == "true", "status": state, "image": image or None})
+    return status
+
+def format_container_ports(info):
+    ports = []
+    for container_port, bindings in sorted(((info.get("NetworkSettings") or {}).get("Ports") or {}).items()):
+        for binding in bindings or []:
+            ports.append(f"{binding.get('HostIp') or '0.0.0.0'}:{binding.get('HostPort')}->{container_port}")
+    return ", ".join(ports)
+
+def print_container_status(info, logs):
+    """Show what check_container_status prints, from an inspect result and recent logs."""
+    if info is None:
+        print(f"❌ No container named '{CONTAINER_NAME}' found.")
+        print("💡 Use option 5 to start the miner.")
+        return False
+    state = info.get("State") or {}
+    if state.get("Running"):
+        status = f"Up since {state.get('StartedAt', '')[:19].replace('T', ' ')} UTC"
+    else:
+        status = f"{(state.get('Status') or 'unknown').capitalize()} ({state.get('ExitCode')}) at {state.get('FinishedAt', '')[:19].replace('T', ' ')} UTC"
+    print("🐳 Docker Container Status:")
+    print(f"{'NAMES':<24}\t{'STATUS':<36}\tPORTS")
+    print(f"{CONTAINER_NAME:<24}\t{status:<36}\t{format_container_ports(info)}")
+    print()
+    if state.get("Running"):
+        print("✅ Container is currently running")
+        print("📜 Recent logs:")
+        sys.stdout.write(logs or "")
+        sys.stdout.flush()
+        reset_terminal_colors()  # Reset colors after viewing logs
+    else:
+        print("⏸️ Container exists but is not running")
+        print("💡 Use 'Restart container' to start it with your current streamer list")
+    return True
+
 def check_container_status():
     """
     Check the status of the Docker container and display useful information.
+    Uses one inspect and one logs request when the engine socket is available.
     """
+    api = docker_api()
+    if api:
+        try:
+            info = api.inspect_container(CONTAINER_NAME)
+            running = info is not None and (info.get("State") or {}).get("Running")
+            logs = api.container_logs(CONTAINER_NAME, tail=10) if running else None
+            return print_container_status(info, logs)
+        except (OSError, DockerAPIError) as e:
+            print(f"[Docker] API request failed ({e}), falling back to the docker CLI")
+    
     # Check if container exists and get its status
     check_cmd = ["docker", "ps", "-a", "-f", f"name=^{CONTAINER_NAME}$", "--format", "table {{.Names}}\t{{.Status}}\t{{.Ports}}"]
     result = subprocess.run(check_cmd, capture_output=True, text=True)
@@ -61,11 +354,39 @@ def check_container_status():
     
     return True
 
-def restart_container():
+def restart_container(interactive=True):
     """
     Restart an existing container to apply new streamer list changes.
     This is much simpler than stop/remove/recreate when you just want to apply config changes.
+    With interactive=False nothing waits on the keyboard and no logs are tailed, for scheduled runs.
     """
+    api = docker_api()
+    if api:
+        print(f"🔄 Restarting container '{CONTAINER_NAME}' to apply new streamer list...")
+        try:
+            restarted = api.restart_container(CONTAINER_NAME)
+        except (OSError, DockerAPIError) as e:
+            print(f"❌ Failed to restart container '{CONTAINER_NAME}': {e}")
+            return False
+        if not restarted:
+            print(f"❌ No container named '{CONTAINER_NAME}' found.")
+            print("💡 Use option 5 to start the miner first.")
+            if interactive:
+                input("Press Enter to continue...")
+            return False
+        print(f"✅ Container '{CONTAINER_NAME}' restarted successfully!")
+        print("📋 The miner will now use your updated streamer list.")
+        if interactive:
+            print("\n📜 Container logs (press Ctrl+C to stop viewing):")
+            try:
+                api.follow_logs(CONTAINER_NAME, tail=20, duration=10)
+            except (OSError, DockerAPIError, KeyboardInterrupt):
+                pass
+            finally:
+                reset_terminal_colors()  # Reset colors after viewing logs
+            print(f"\n📋 Container is running. Use 'docker logs -f {CONTAINER_NAME}' to view logs.")
+        return True
+    
     # Check if container exists (running or stopped)
     check_cmd = ["docker", "ps", "-a", "-q", "-f", f"name=^{CONTAINER_NAME}$"]
     exists = subprocess.run(check_cmd, capture_output=True, text=True)
@@ -73,7 +394,8 @@ def restart_container():
     if not exists.stdout.strip():
         print(f"❌ No container named '{CONTAINER_NAME}' found.")
         print("💡 Use option 5 to start the miner first.")
-        input("Press Enter to continue...")
+        if interactive:
+            input("Press Enter to continue...")
         return False
     
     print(f"🔄 Restarting container '{CONTAINER_NAME}' to apply new streamer list...")
@@ -85,6 +407,8 @@ def restart_container():
     if result.returncode == 0:
         print(f"✅ Container '{CONTAINER_NAME}' restarted successfully!")
         print("📋 The miner will now use your updated streamer list.")
+        if not interactive:
+            return True
         
         # Show container logs for a few seconds
         print("\n📜 Container logs (press Ctrl+C to stop viewing):")
@@ -101,21 +425,97 @@ def restart_container():
         print(f"❌ Failed to restart container '{CONTAINER_NAME}'")
         return False
 
+def build_inputs_hash():
+    """sha256 over the name and content of every existing build input; mtimes play no part."""
+    digest = hashlib.sha256()
+    for path in BUILD_INPUTS:
+        if not os.path.exists(path):
+            continue
+        with open(path, "rb") as f:
+            content = f.read()
+        digest.update(f"{path}\0{len(content)}\0".encode("utf-8"))
+        digest.update(content)
+    return digest.hexdigest()
+
 def build_image():
     print(f"Building Docker image '{FULL_IMAGE}' from {DOCKERFILE}...")
     result = subprocess.run([
-        "docker", "build", "-f", DOCKERFILE, "-t", FULL_IMAGE, "."
+        "docker", "build", "-f", DOCKERFILE, "-t", FULL_IMAGE,
+        "--label", f"{BUILD_HASH_LABEL}={build_inputs_hash()}", "."
     ])
     if result.returncode != 0:
         print("Docker build failed!")
         sys.exit(1)
     print("Docker image built successfully.")
 
+def abs_path_clean(path):
+    return os.path.abspath(path).strip()
+
+def container_binds():
+    """(host path, container path, mode) for everything mounted into the miner container."""
+    binds = [
+        (abs_path_clean('cookies'), "/usr/src/app/cookies", None),
+        (abs_path_clean('logs'), "/usr/src/app/logs", None),
+        (abs_path_clean('analytics'), "/usr/src/app/analytics", None),
+        (abs_path_clean('run.py'), "/usr/src/app/run.py", "ro"),
+    ]
+    for fname in TXT_FILES:
+        binds.append((abs_path_clean(fname), f"/usr/src/app/{fname}", None))
+    return binds
+
+def container_config():
+    """Engine API create body equivalent to `docker run -it --restart unless-stopped -p 5000:5000` with container_binds()."""
+    return {
+        "Image": FULL_IMAGE,
+        "Tty": True,
+        "OpenStdin": True,
+        "ExposedPorts": {"5000/tcp": {}},
+        "HostConfig": {
+            "Binds": [":".join(part for part in bind if part) for bind in container_binds()],
+            "PortBindings": {"5000/tcp": [{"HostPort": "5000"}]},
+            "RestartPolicy": {"Name": "unless-stopped"},
+        },
+    }
+
+def run_container_api(api):
+    """
+    run_container over the Engine API: one inspect, then stop/remove/create/start calls.
+    The container starts detached; recent logs are shown instead of attaching the terminal.
+    """
+    info = api.inspect_container(CONTAINER_NAME)
+    if info is not None:
+        running = (info.get("State") or {}).get("Running")
+        if running:
+            print(f"A container named '{CONTAINER_NAME}' is already running.")
+            resp = input("Stop and remove it before starting a new one? (y/n): ").strip().lower()
+        else:
+            print(f"A stopped container named '{CONTAINER_NAME}' already exists.")
+            resp = input("Remove it and create a new one? (y/n): ").strip().lower()
+        if resp != "y":
+            print("Cancelled Docker start. Returning to menu.")
+            input("Press Enter to continue...")
+            return False
+        if running:
+            api.stop_container(CONTAINER_NAME)
+            print(f"Stopped container '{CONTAINER_NAME}'.")
+        api.remove_container(CONTAINER_NAME)
+        print(f"Removed container '{CONTAINER_NAME}'.")
+    
+    print("\n[Docker] Creating container with persistent cookies/logs/analytics, run.py, and .txt streamer files mounted...")
+    api.create_container(CONTAINER_NAME, container_config())
+    api.start_container(CONTAINER_NAME)
+    print(f"✅ Container '{CONTAINER_NAME}' started (restart policy: unless-stopped).")
+    print("\n📜 Container logs (press Ctrl+C to stop viewing):")
+    try:
+        api.follow_logs(CONTAINER_NAME, tail=20, duration=10)
+    except (OSError, DockerAPIError, KeyboardInterrupt):
+        pass
+    finally:
+        reset_terminal_colors()  # Reset colors after viewing logs
+    print(f"\n📋 Container is running. Use 'docker logs -f {CONTAINER_NAME}' to view logs.")
+    return True
+
 def run_container():
-    import subprocess
-    import os
-    def abs_path_clean(path):
-        return os.path.abspath(path).strip()
     # Ensure all .txt files exist before running Docker
     for fname in TXT_FILES:
         if not os.path.exists(fname):
@@ -123,6 +523,13 @@ def run_container():
             with open(fname, "w", encoding="utf-8") as f:
                 f.write("")
     
+    api = docker_api()
+    if api:
+        try:
+            return run_container_api(api)
+        except (OSError, DockerAPIError) as e:
+            print(f"[Docker] API request failed ({e}), falling back to the docker CLI")
+    
     # Check if container exists (running or stopped)
     check_cmd = ["docker", "ps", "-a", "-q", "-f", f"name=^{CONTAINER_NAME}$"]
     existing = subprocess.run(check_cmd, capture_output=True, text=True)
@@ -153,14 +560,7 @@ def run_container():
             print("Cancelled Docker start. Returning to menu.")
             input("Press Enter to continue...")
             return False
-    volumes = [
-        f"-v{abs_path_clean('cookies')}:/usr/src/app/cookies",
-        f"-v{abs_path_clean('logs')}:/usr/src/app/logs",
-        f"-v{abs_path_clean('analytics')}:/usr/src/app/analytics",
-        f"-v{abs_path_clean('run.py')}:/usr/src/app/run.py:ro"
-    ]
-    for fname in TXT_FILES:
-        volumes.append(f"-v{abs_path_clean(fname)}:/usr/src/app/{fname}")
+    volumes = ["-v" + ":".join(part for part in bind if part) for bind in container_binds()]
     ports = ["-p", "5000:5000"]
     image = FULL_IMAGE
     cmd = ["docker", "run", "-it", "--restart", "unless-stopped", "--name", CONTAINER_NAME] + volumes + ports + [image]
@@ -176,42 +576,40 @@ def ensure_txt_files():
             with open(fname, "w", encoding="utf-8") as f:
                 f.write("")
 
-def needs_rebuild():
-    # Check if image exists using docker image inspect
+def image_build_hash():
+    """
+    (exists, build hash label) of FULL_IMAGE from a single inspect.
+    The label is None for images built before gibdrop stamped them.
+    """
+    api = docker_api()
+    if api:
+        try:
+            info = api.inspect_image(FULL_IMAGE)
+            if info is None:
+                return False, None
+            return True, ((info.get("Config") or {}).get("Labels") or {}).get(BUILD_HASH_LABEL)
+        except (OSError, DockerAPIError) as e:
+            print(f"[Docker] API request failed ({e}), falling back to the docker CLI")
     result = subprocess.run([
-        "docker", "image", "inspect", FULL_IMAGE
+        "docker", "image", "inspect", FULL_IMAGE, "-f", f'{{{{ index .Config.Labels "{BUILD_HASH_LABEL}" }}}}'
     ], capture_output=True, text=True)
     if result.returncode != 0:
+        return False, None
+    label = result.stdout.strip()
+    return True, label if label and label != "<no value>" else None
+
+def needs_rebuild():
+    """
+    Rebuild only when the build inputs' content differs from what the image was built from.
+    touch, git checkout or clock skew no longer trigger a build.
+    """
+    exists, built_hash = image_build_hash()
+    if not exists:
         return True
-    # Check if Dockerfile or requirements.txt changed since last build
-    try:
-        import datetime
-        try:
-            from dateutil import parser as dtparser
-        except ImportError:
-            print("[DEBUG] dateutil not found, falling back to datetime.fromisoformat (Python 3.7+ required)")
-            dtparser = None
-        dockerfile_mtime = os.path.getmtime(DOCKERFILE)
-        reqfile = "requirements.txt"
-        req_mtime = os.path.getmtime(reqfile) if os.path.exists(reqfile) else 0
-        # Get image creation time
-        inspect = subprocess.run([
-            "docker", "image", "inspect", FULL_IMAGE, "-f", "{{.Created}}"
-        ], capture_output=True, text=True)
-        if dtparser:
-            image_time = dtparser.parse(inspect.stdout.strip()) if inspect.returncode == 0 and inspect.stdout.strip() else None
-        else:
-            image_time = datetime.datetime.fromisoformat(inspect.stdout.strip().replace('Z', '+00:00')) if inspect.returncode == 0 and inspect.stdout.strip() else None
-        file_time = max(dockerfile_mtime, req_mtime)
-        if image_time is None:
-            return True
-        file_datetime = datetime.datetime.fromtimestamp(file_time, tz=image_time.tzinfo)
-        if file_datetime > image_time:
-            return True
-    except Exception as e:
-        print(f"[DEBUG] Time comparison failed: {e}")
+    if built_hash is None:
+        print(f"[Docker] Image has no {BUILD_HASH_LABEL} label yet, rebuilding once to stamp it")
         return True
-    return False
+    return built_hash != build_inputs_hash()
 
 def ensure_dockerfile():
     if not os.path.exists(DOCKERFILE):
@@ -0,0 +1,173 @@
+"""
+DockerAPI against a fake Docker engine on a temporary unix socket.
+
+Usage: python3 -m pytest tests
+"""
+import io
+import json
+import os
+import shutil
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import gibdrop_dockermgr
+from gibdrop_dockermgr import DockerAPI, DockerAPIError, demux_log_chunk
+
+
+def frame(text, stream=1):
+    """One multiplexed log frame, as sent for containers without a TTY."""
+    data = text.encode("utf-8")
+    return bytes([stream, 0, 0, 0]) + len(data).to_bytes(4, "big") + data
+
+
+class FakeEngine(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Answers the few endpoints DockerAPI uses. routes maps (method, path) to (status, body) or, for
+    streamed responses, to a list of bytes and float pauses written on an HTTP/1.0 connection.
+    """
+    daemon_threads = True
+
+    def __init__(self, socket_path):
+        self.routes = {}
+        self.requests = []
+        self.connections = 0
+        self.close_after_response = False  # Drop keep-alive connections without saying so
+        super().__init__(socket_path, self.handler_class())
+
+    def handler_class(self):
+        engine = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                engine.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def handle_one_request(self):
+                super().handle_one_request()
+                if engine.close_after_response:
+                    self.close_connection = True
+
+            def respond(self):
+                path = self.path.split("?", 1)[0]
+                engine.requests.append((self.command, self.path))
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                route = engine.routes.get((self.command, path), (404, {"message": f"no such route: {path}"}))
+                if isinstance(route, list):
+                    self.stream(route)
+                    return
+                status, body = route
+                data = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8") if body is not None else b""
+                self.send_response(status)
+                if status != 204:
+                    self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                if status != 204:
+                    self.wfile.write(data)
+
+            def stream(self, parts):
+                self.wfile.write(b"HTTP/1.0 200 OK\r\nContent-Type: application/vnd.docker.multiplexed-stream\r\n\r\n")
+                for part in parts:
+                    if isinstance(part, float):
+                        time.sleep(part)
+                    else:
+                        self.wfile.write(part)
+                        self.wfile.flush()
+                self.close_connection = True
+
+            do_GET = do_POST = do_DELETE = respond
+
+        return Handler
+
+
+class DockerAPITest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.engine = FakeEngine(os.path.join(self.tmpdir, "docker.sock"))
+        threading.Thread(target=self.engine.serve_forever, daemon=True).start()
+        self.api = DockerAPI(self.engine.server_address, timeout=5)
+
+    def tearDown(self):
+        self.api.close()
+        self.engine.shutdown()
+        self.engine.server_close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_inspect_container(self):
+        name = gibdrop_dockermgr.CONTAINER_NAME
+        self.engine.routes[("GET", f"/containers/{name}/json")] = (200, {"State": {"Running": True, "Status": "running"}})
+        self.assertEqual(self.api.inspect_container(name)["State"]["Status"], "running")
+        self.assertIsNone(self.api.inspect_container("missing"))
+
+    def test_error_message(self):
+        self.engine.routes[("POST", "/containers/miner/start")] = (500, {"message": "port is already allocated"})
+        with self.assertRaises(DockerAPIError) as raised:
+            self.api.start_container("miner")
+        self.assertEqual(raised.exception.status, 500)
+        self.assertIn("port is already allocated", str(raised.exception))
+
+    def test_container_logs_demux(self):
+        self.engine.routes[("GET", "/containers/miner/logs")] = (200, frame("first\n") + frame("oops\n", stream=2) + frame("second\n"))
+        self.assertEqual(self.api.container_logs("miner"), "first\noops\nsecond\n")
+
+    def test_demux_keeps_partial_frame(self):
+        data = frame("one\n") + frame("two\n")
+        text, pending = demux_log_chunk(data[:-2])
+        self.assertEqual(text, "one\n")
+        self.assertEqual(demux_log_chunk(pending + data[-2:]), ("two\n", b""))
+        self.assertEqual(demux_log_chunk(b"tty output\n"), ("tty output\n", b""))
+
+    def test_restart_container(self):
+        self.engine.routes[("POST", "/containers/miner/restart")] = (204, None)
+        self.assertTrue(self.api.restart_container("miner"))
+        self.assertFalse(self.api.restart_container("missing"))
+        self.assertIn(("POST", f"/containers/miner/restart?t={gibdrop_dockermgr.DOCKER_STOP_TIMEOUT}"), self.engine.requests)
+
+    def test_keep_alive_connection_is_reused(self):
+        self.engine.routes[("GET", "/_ping")] = (200, b"OK")
+        for _ in range(3):
+            self.assertTrue(self.api.ping())
+        self.assertEqual(self.engine.connections, 1)
+
+    def test_reconnects_after_engine_closes_connection(self):
+        self.engine.routes[("GET", "/_ping")] = (200, b"OK")
+        self.engine.close_after_response = True
+        self.assertTrue(self.api.ping())
+        time.sleep(0.1)  # Let the engine close its end
+        self.assertTrue(self.api.ping())
+        self.assertEqual(self.engine.connections, 2)
+
+    def test_follow_logs_survives_quiet_gaps(self):
+        self.engine.routes[("GET", "/containers/miner/logs")] = [frame("first\n"), 0.8, frame("second\n")[:5], 0.3, frame("second\n")[5:]]
+        out = io.StringIO()
+        self.api.follow_logs("miner", duration=5, out=out)
+        self.assertEqual(out.getvalue(), "first\nsecond\n")
+
+    def test_follow_logs_stops_at_deadline(self):
+        self.engine.routes[("GET", "/containers/miner/logs")] = [frame("first\n"), 3.0, frame("late\n")]
+        out = io.StringIO()
+        started = time.monotonic()
+        self.api.follow_logs("miner", duration=0.5, out=out)
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(out.getvalue(), "first\n")
+
+    def test_follow_logs_missing_container(self):
+        with self.assertRaises(DockerAPIError) as raised:
+            self.api.follow_logs("missing", duration=2, out=io.StringIO())
+        self.assertEqual(raised.exception.status, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()